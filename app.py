@@ -1,7 +1,6 @@
 import sys
 import os
-from flask import Flask, render_template, jsonify, request
-import requests
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
 from bs4 import BeautifulSoup
 import logging
 from datetime import datetime
@@ -24,8 +23,14 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize database and scheduler
-from database import init_db, get_articles_by_date, get_stats
+from database import (
+    init_db, get_article_rows, search_articles, get_stats, save_article_body, get_article_body,
+    set_starred, get_starred_since, starred_links
+)
 from scheduler.scheduler import init_scheduler, shutdown_scheduler, get_next_run_times
+from utils.browser_pool import get_browser_pool, shutdown_browser_pool
+from utils.render_profile import get_render_profile, ResourceStats
+from utils.crawl_status import crawl_status_store
 
 # Initialize database on startup
 logger.info("Initializing database...")
@@ -40,6 +45,7 @@ logger.info("✓ Scheduler ready")
 # Register cleanup on shutdown
 import atexit
 atexit.register(shutdown_scheduler)
+atexit.register(shutdown_browser_pool)
 
 # ============ 状态管理系统 ============
 class CrawlState(Enum):
@@ -50,38 +56,46 @@ class CrawlState(Enum):
     FAILED = "failed"          # 失败
 
 class SourceCrawlStatus:
-    """单个数据源的爬取状态"""
-    def __init__(self, source_key):
+    """单个数据源的爬取状态（保存在 crawl_status_store 中，所有 worker 共享）"""
+    def __init__(self, source_key, store=crawl_status_store):
         self.source_key = source_key
-        self.state = CrawlState.IDLE
-        self.progress = 0  # 0-100
-        self.logs = []  # 日志队列
-        self.total_articles = 0
-        self.start_time = None
-        self.end_time = None
+        self.store = store
+    
+    @property
+    def state(self):
+        return CrawlState(self.store.get(self.source_key)['state'])
+    
+    @property
+    def progress(self):
+        return self.store.get(self.source_key)['progress']
+    
+    @property
+    def total_articles(self):
+        return self.store.get(self.source_key)['total_articles']
+    
+    @property
+    def logs(self):
+        return self.store.recent_logs(self.source_key, limit=self.store.max_logs)
+    
+    def try_start(self, message=None):
+        """标记为运行中（已在运行则返回 False），并清空上一次的日志"""
+        return self.store.try_start(self.source_key, message)
+    
+    def update(self, state=None, **fields):
+        """更新状态字段（state, progress, total_articles, start_time, end_time）"""
+        if state is not None:
+            fields['state'] = state.value
+        self.store.update(self.source_key, **fields)
     
     def add_log(self, message):
-        """添加日志"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        log_entry = f"[{timestamp}] {message}"
-        self.logs.append(log_entry)
-        # 只保留最后100条日志
-        if len(self.logs) > 100:
-            self.logs.pop(0)
+        """添加日志（只保留最后 CRAWL_MAX_LOGS 条）"""
+        self.store.add_log(self.source_key, message)
     
     def to_dict(self):
         """转换为字典"""
-        return {
-            'source_key': self.source_key,
-            'state': self.state.value,
-            'progress': self.progress,
-            'logs': self.logs[-20:],  # 返回最后20条日志
-            'total_articles': self.total_articles,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None
-        }
+        return self.store.to_dict(self.source_key)  # 包含最后20条日志
 
-# 全局爬取状态管理
+# 全局爬取状态管理（状态本身存储在共享的 SQLite 中）
 CRAWL_STATUS = {
     'fujian': SourceCrawlStatus('fujian'),
     'hainan': SourceCrawlStatus('hainan'),
@@ -90,8 +104,6 @@ CRAWL_STATUS = {
     'guangxi': SourceCrawlStatus('guangxi')
 }
 
-CRAWL_LOCK = threading.Lock()  # 保证线程安全
-
 
 def get_current_date_strs():
     now = datetime.now()
@@ -138,6 +150,27 @@ def get_all_crawl_status():
         for source_key, status in CRAWL_STATUS.items()
     })
 
+@app.route('/api/crawl/stream')
+@app.route('/api/crawl/stream/<source_key>')
+def stream_crawl_status(source_key=None):
+    """
+    以 Server-Sent Events 推送爬取状态和日志（单个数据源或全部）
+    
+    事件: 'status'（状态变化时）和 'log'（每条日志，id 为日志 id）。
+    断线重连时浏览器会带上 Last-Event-ID，从该条之后继续推送。
+    """
+    if source_key is not None and source_key not in CRAWL_STATUS:
+        return jsonify({'error': 'Invalid source'}), 400
+    
+    source_keys = [source_key] if source_key else list(CRAWL_STATUS)
+    after_id = request.headers.get('Last-Event-ID', type=int) or request.args.get('last_id', 0, type=int)
+    
+    return Response(
+        stream_with_context(crawl_status_store.events(source_keys, after_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/crawl/start/<source_key>', methods=['POST'])
 def start_crawl(source_key):
     """手动启动某个数据源的爬取"""
@@ -150,8 +183,8 @@ def start_crawl(source_key):
     
     status = CRAWL_STATUS[source_key]
     
-    # 如果已在运行，返回错误
-    if status.state == CrawlState.RUNNING:
+    # 如果已在运行（任一 worker 中），返回错误
+    if not status.try_start(f"Starting crawl for {date_str}"):
         return jsonify({'error': 'Crawl already running'}), 400
     
     # 在后台线程启动爬取
@@ -168,44 +201,45 @@ def _crawl_source_background(source_key, date_str):
     """后台爬取任务"""
     status = CRAWL_STATUS[source_key]
     
-    with CRAWL_LOCK:
-        status.state = CrawlState.RUNNING
-        status.start_time = datetime.now()
-        status.logs.clear()
-        status.total_articles = 0
-        status.add_log(f"Starting crawl for {date_str}")
-    
-    # 在应用上下文中执行爬取
+    # 在应用上下文中执行爬取（状态已由 start_crawl 置为 RUNNING）
     with app.app_context():
         try:
             # 调用爬取逻辑
             current_date = datetime.strptime(date_str, '%Y-%m-%d')
             result = _perform_crawl(source_key, current_date, date_str, status)
             
-            with CRAWL_LOCK:
-                status.total_articles = result.get('count', 0)
-                status.state = CrawlState.COMPLETED
-                status.progress = 100
-                status.end_time = datetime.now()
-                status.add_log(f"✓ Crawl completed: {result.get('count', 0)} articles")
+            status.add_log(f"✓ Crawl completed: {result.get('count', 0)} articles")
+            status.update(
+                state=CrawlState.COMPLETED,
+                total_articles=result.get('count', 0),
+                progress=100,
+                end_time=datetime.now().isoformat()
+            )
         
         except Exception as e:
-            with CRAWL_LOCK:
-                status.state = CrawlState.FAILED
-                status.end_time = datetime.now()
-                status.add_log(f"✗ Crawl failed: {str(e)}")
-                logger.error(f"Crawl error for {source_key}: {e}")
+            status.add_log(f"✗ Crawl failed: {str(e)}")
+            status.update(state=CrawlState.FAILED, end_time=datetime.now().isoformat())
+            logger.error(f"Crawl error for {source_key}: {e}")
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from deep_translator import GoogleTranslator
 import threading
-from playwright.sync_api import sync_playwright
 
 # Import new fetcher and URL generators
 from utils.fetcher import fetch_html
+from utils.http_engine import get_engine
+from utils.cache import ArticleCache
+from utils.shared_cache import shared_cache
+from utils.singleflight import SingleFlight
+from utils.prefetch import PrefetchPool, PRIORITY_USER
 from sources.gzdaily import gzdaily_index_url, gzdaily_section_url
+from sources.gzdaily_live import parse_gzdaily_index, fetch_gzdaily_sections
 from sources.nfdaily import nfdaily_section_url, nfdaily_article_url
-from sources.nanfang_live import fetch_nanfang_articles
+from sources.nanfang_live import fetch_nanfang_edition
+from sources.guangxi_live import (
+    probe_guangxi_edition, render_guangxi_page, capture_section_data,
+    parse_guangxi_article_text, parse_guangxi_data_response, article_entries_from_payloads,
+    build_data_url, build_article_url as build_guangxi_article_url
+)
 
 def translate_text(text, target='ko'):
     """
@@ -216,84 +250,67 @@ def translate_text(text, target='ko'):
     # logger.debug("Translation disabled, returning original text")
     return text
 
-def fetch_guangxi_article_with_playwright(url):
-    """Fetch Guangxi Daily article using Playwright to execute JavaScript."""
+def fetch_guangxi_article_with_playwright(url, stats=None):
+    """Fetch Guangxi Daily article using Playwright to execute JavaScript.
+    
+    Args:
+        url: Article URL
+        stats: Optional ResourceStats to accumulate blocked/received counters
+    """
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            # Use domcontentloaded instead of networkidle for better compatibility
-            page.goto(url, timeout=35000, wait_until='domcontentloaded')
-            # Wait longer for JavaScript to execute and load content
-            page.wait_for_timeout(5000)
-            
-            # Get all text content from the page
-            all_text = page.inner_text('body')
-            browser.close()
-            
-            # Split into lines and filter
-            lines = [line.strip() for line in all_text.split('\n') if line.strip()]
-            
-            # Find title - try multiple strategies
-            title = None
-            content_lines = []
-            
-            # Strategy 1: Look for title with author marker (most reliable)
-            for i, line in enumerate(lines):
-                # Skip navigation and metadata
-                if any(skip in line for skip in ['数字报首页', '按日期查找', '版面导航', '字体：', '返回', '新闻中心', 'ICP证', '广西新闻网版权']):
-                    continue
-                
-                # Look for title - substantial line before author marker
-                if not title and 15 < len(line) < 200:
-                    # Check if next few lines contain author marker
-                    next_lines = lines[i+1:i+5]
-                    if any('■' in l or '广西云-广西日报记者' in l or '广西日报记者' in l or '通讯员' in l for l in next_lines):
-                        title = line
-                        break
-            
-            # Strategy 2: If no title found, look for substantial lines after date marker
-            if not title:
-                found_date_marker = False
-                for i, line in enumerate(lines):
-                    # Look for date/edition marker like "2025年11月20日第 001 版）"
-                    if '年' in line and '月' in line and '日' in line and '版）' in line:
-                        found_date_marker = True
-                        continue
-                    
-                    # After date marker, find first substantial line
-                    if found_date_marker and 10 < len(line) < 200:
-                        # Skip common non-title patterns
-                        if any(skip in line for skip in ['数字报首页', '按日期查找', '版面导航', '字体', '返回', '发布时间', '各版主要新闻']):
-                            continue
-                        title = line
-                        break
-            
-            # Collect content
-            for i, line in enumerate(lines):
-                if len(line) > 30:
-                    if '本报讯' in line or '（广西云-广西日报记者' in line:
-                        content_lines.append(line)
-                    elif not any(skip in line for skip in ['发布时间', '版中缝', '各版主要新闻', '数字报首页', '按日期查找']):
-                        # Only add if it looks like content
-                        if any(char in line for char in ['，', '。', '、', '：']):
-                            content_lines.append(line)
-            
-            return {
-                'title': title,
-                'content': content_lines[:10]  # Limit to first 10 paragraphs
-            }
-            
+        # Reuse a pooled Chromium instead of launching one per article;
+        # the source's render profile aborts images, fonts, CSS and analytics
+        all_text = get_browser_pool().run(
+            lambda page: render_guangxi_page(page, url),
+            profile=get_render_profile('guangxi'),
+            stats=stats
+        )
+        
+        return parse_guangxi_article_text(all_text)
+        
     except Exception as e:
         logging.error(f"Error fetching Guangxi article with Playwright: {e}")
         return None
 
-def fetch_page_items(session, url, source_type, section_name=""):
+def fetch_guangxi_article_via_http(url):
+    """Fetch Guangxi Daily article from the e-paper's data endpoint (no browser).
+    
+    Returns None when the endpoint is unavailable or returns nothing usable.
+    """
     try:
-        resp = session.get(url, timeout=10)
+        resp = get_engine().get(build_data_url(url), timeout=10)
+        resp.raise_for_status()
         resp.encoding = 'utf-8'
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        return parse_guangxi_data_response(resp.text)
+    except Exception as e:
+        logger.debug(f"Guangxi data endpoint unavailable for {url}: {e}")
+        return None
+
+def fetch_guangxi_article(url, stats=None):
+    """Fetch Guangxi Daily article with plain HTTP, rendering it only as a fallback."""
+    article_data = fetch_guangxi_article_via_http(url)
+    if article_data and article_data.get('title'):
+        return article_data
+    return fetch_guangxi_article_with_playwright(url, stats=stats)
+
+def discover_guangxi_section(date_str, code, stats=None):
+    """Render one Guangxi section page and read its article list from captured JSON.
+    
+    Returns None when no article list could be captured.
+    """
+    url = build_guangxi_article_url(date_str, code, 1)
+    payloads = get_browser_pool().run(
+        lambda page: capture_section_data(page, url),
+        profile=get_render_profile('guangxi'),
+        stats=stats
+    )
+    return article_entries_from_payloads(payloads)
+
+CRAWL_HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
+
+def parse_page_items(html, url, source_type, section_name=""):
+    try:
+        soup = BeautifulSoup(html, 'html.parser')
         items = []
         
         if source_type == 'fujian':
@@ -332,26 +349,73 @@ def fetch_page_items(session, url, source_type, section_name=""):
         
         return items
     except Exception as e:
-        logging.error(f"Error fetching page {url}: {e}")
+        logging.error(f"Error parsing page {url}: {e}")
         return []
 
-# Global Cache
-ARTICLE_CACHE = {}
-STARRED_ITEMS = {} # Key: URL, Value: Item Data
+# Global Cache: bounded per-process LRU with TTL, backed by a SQLite store
+# shared by all gunicorn workers (see utils/cache.py, utils/shared_cache.py)
+ARTICLE_CACHE = ArticleCache(backend=shared_cache)
+
+# In-flight article fetches, so concurrent requests for one URL fetch once
+ARTICLE_FLIGHTS = SingleFlight()
+
+# How long a caller waits for another caller's in-flight fetch (seconds)
+ARTICLE_FETCH_WAIT = float(os.environ.get('ARTICLE_FETCH_WAIT', '120'))
+
+def remember_article(url, result):
+    """Keep a fetched article in memory and persist its body for later restarts."""
+    ARTICLE_CACHE.set(url, result)
+    try:
+        save_article_body(url, result)
+    except Exception as e:
+        logger.error(f"Failed to store article body for {url}: {e}")
 
-def fetch_and_translate_article_logic(url):
-    """Helper function to fetch and translate article, used by route and background task."""
-    if url in ARTICLE_CACHE:
-        print(f"Cache hit for {url}")
-        return ARTICLE_CACHE[url]
 
+def fetch_article(url):
+    """
+    Fetch an article from the newspaper site (cache miss path).
+    
+    Callers check load_stored_article() first; this does not look again,
+    so every request counts one lookup per cache tier.
+    """
+    # Concurrent callers for the same URL share one fetch
+    try:
+        return ARTICLE_FLIGHTS.do(url, load_article, url, timeout=ARTICLE_FETCH_WAIT)
+    except TimeoutError as e:
+        logger.error(str(e))
+        return None
+
+
+def load_stored_article(url):
+    """Return an article from the cache (all tiers) or the database, or None."""
+    cached = ARTICLE_CACHE.get(url)
+    if cached is not None:
+        return cached
+    
+    # Previously viewed articles are stored compressed in the database
+    try:
+        body = get_article_body(url)
+    except Exception as e:
+        logger.error(f"Failed to load stored body for {url}: {e}")
+        body = None
+    if body:
+        print(f"Database hit for {url}")
+        result = {'status': 'success', **body}
+        ARTICLE_CACHE.set(url, result)
+        return result
+    
+    return None
+
+
+def load_article(url):
+    """Fetch an article from the newspaper site and remember it."""
     print(f"Fetching {url}...")
     
     # Check if this is a Guangxi Daily URL
     if 'gxrb.gxrb.com.cn' in url:
         try:
-            # Use Playwright for Guangxi Daily
-            article_data = fetch_guangxi_article_with_playwright(url)
+            # Use the data endpoint, falling back to Playwright for Guangxi Daily
+            article_data = fetch_guangxi_article(url)
             
             if not article_data or not article_data.get('title'):
                 return None
@@ -372,8 +436,8 @@ def fetch_and_translate_article_logic(url):
                 'content_ko': translated_paragraphs
             }
             
-            # Store in cache
-            ARTICLE_CACHE[url] = result
+            # Store in cache and database
+            remember_article(url, result)
             return result
             
         except Exception as e:
@@ -383,7 +447,7 @@ def fetch_and_translate_article_logic(url):
     # Check if this is a Nanfang Daily URL (southcn.com or nfnews.com)
     if 'southcn.com' in url or 'nfnews.com' in url:
         try:
-            resp = requests.get(url, headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}, timeout=10)
+            resp = get_engine().get(url, headers=CRAWL_HEADERS, timeout=10)
             resp.encoding = 'utf-8'
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -428,7 +492,7 @@ def fetch_and_translate_article_logic(url):
                     'content_cn': original_html,
                     'content_ko': translated_paragraphs
                 }
-                ARTICLE_CACHE[url] = result
+                remember_article(url, result)
                 return result
         except Exception as e:
             print(f"Error fetching Nanfang article {url}: {e}")
@@ -436,7 +500,7 @@ def fetch_and_translate_article_logic(url):
 
     # For other newspapers, use regular requests
     try:
-        resp = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+        resp = get_engine().get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
         resp.encoding = 'utf-8'
         soup = BeautifulSoup(resp.text, 'html.parser')
         
@@ -469,8 +533,8 @@ def fetch_and_translate_article_logic(url):
                 'content_ko': translated_paragraphs
             }
             
-            # Store in cache
-            ARTICLE_CACHE[url] = result
+            # Store in cache and database
+            remember_article(url, result)
             return result
             
     except Exception as e:
@@ -522,11 +586,28 @@ def selection_page():
 def guangxi_page():
     return render_template('guangxi.html')
 
+# Bounded worker pool for article fetches (replaces a thread per star)
+ARTICLE_FETCH_POOL = PrefetchPool(fetch_article)
+
+
 @app.route('/api/selection')
 def get_selection():
-    # Return list of starred items
-    items = list(STARRED_ITEMS.values())
-    return jsonify({'status': 'success', 'data': items})
+    """
+    Starred items, stored in the starred_items table.
+    
+    With ?since=<cursor> only the changes after that cursor are returned
+    (new items in 'data', unstarred links in 'removed'); 'full' tells the
+    client to replace its list instead of applying the changes.
+    """
+    since = request.args.get('since', default=0, type=int)
+    selection = get_starred_since(since)
+    return jsonify({
+        'status': 'success',
+        'data': selection['items'],
+        'removed': selection['removed'],
+        'cursor': selection['cursor'],
+        'full': selection['full'],
+    })
 
 @app.route('/api/article')
 def get_article():
@@ -534,11 +615,18 @@ def get_article():
     if not url:
         return jsonify({'error': 'Missing URL'}), 400
         
-    # Check cache first
-    if url in ARTICLE_CACHE:
-        return jsonify(ARTICLE_CACHE[url])
-        
-    result = fetch_and_translate_article_logic(url)
+    # Cached (any tier) or stored articles are served directly; only real
+    # misses go to the fetch pool
+    result = load_stored_article(url)
+    if result is None:
+        # Fetch on the bounded pool; user-opened articles jump ahead of
+        # queued star prefetches
+        try:
+            result = ARTICLE_FETCH_POOL.submit(url, priority=PRIORITY_USER).result(timeout=ARTICLE_FETCH_WAIT)
+        except Exception as e:
+            logger.error(f"Error fetching article {url}: {e}")
+            result = None
+    
     if result:
         return jsonify(result)
     else:
@@ -557,21 +645,104 @@ def toggle_star():
         return jsonify({'error': 'Missing URL'}), 400
         
     if starred:
-        if item_data:
-            item_data['starred'] = True
-            STARRED_ITEMS[url] = item_data
+        cursor = set_starred(url, True, item_data)
             
-        # Trigger background fetch
-        thread = threading.Thread(target=fetch_and_translate_article_logic, args=(url,))
-        thread.start()
-        return jsonify({'status': 'success', 'message': 'Added to selection and fetching started'})
+        # Queue a background prefetch (deduplicated, bounded) unless the
+        # article is already cached or stored
+        if load_stored_article(url) is None:
+            ARTICLE_FETCH_POOL.submit(url)
+        return jsonify({'status': 'success', 'message': 'Added to selection and fetching started', 'cursor': cursor})
     else:
-        if url in STARRED_ITEMS:
-            del STARRED_ITEMS[url]
+        cursor = set_starred(url, False)
         
         # Optional: Remove from cache if unstarred? 
         # Keeping in cache for now as per previous decision
-        return jsonify({'status': 'success', 'message': 'Removed from selection'})
+        return jsonify({'status': 'success', 'message': 'Removed from selection', 'cursor': cursor})
+
+SOURCE_NAMES = {
+    'fujian': '福建日报',
+    'hainan': '海南日报',
+    'nanfang': '南方日报',
+    'guangzhou': '广州日报',
+    'guangxi': '广西日报'
+}
+
+@app.route('/api/news')
+def get_news_batch():
+    """
+    Get news for several sources and one date in a single request.
+    
+    Query params: sources (comma-separated, default all), date (YYYY-MM-DD,
+    default today). Articles of all sources are read with one query
+    (date = ? AND source_key IN (...)) and crawl states with one lookup.
+    
+    Response: 'status' is the combined state ('loaded' if any source has
+    articles, else 'loading' if any is crawling, else 'empty'); 'sources'
+    has each source's name, state, article count and crawl_status (without
+    logs); 'data' has the articles of all sources.
+    """
+    date_str = request.args.get('date')
+    if date_str:
+        try:
+            datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'error': 'Invalid date format'}), 400
+    else:
+        date_str = datetime.now().strftime('%Y-%m-%d')
+    
+    sources_param = request.args.get('sources')
+    source_keys = [s.strip() for s in sources_param.split(',') if s.strip()] if sources_param else list(CRAWL_STATUS)
+    invalid = [key for key in source_keys if key not in CRAWL_STATUS]
+    if invalid or not source_keys:
+        return jsonify({'error': f"Invalid source: {', '.join(invalid)}"}), 400
+    source_keys = list(dict.fromkeys(source_keys))
+    
+    error = None
+    try:
+        articles_data = get_article_rows(source_key=source_keys, date_str=date_str)
+    except Exception as e:
+        logger.error(f"[batch] Database error: {e}")
+        articles_data, error = [], str(e)
+    
+    # Keep the requested source order (the query orders by source_key)
+    order = {key: i for i, key in enumerate(source_keys)}
+    articles_data.sort(key=lambda item: order[item['source_key']])
+    
+    counts = dict.fromkeys(source_keys, 0)
+    for item in articles_data:
+        counts[item['source_key']] += 1
+    
+    statuses = crawl_status_store.get_many(source_keys)
+    sources = {}
+    for source_key in source_keys:
+        crawl_status = statuses[source_key]
+        crawl_status.pop('version')
+        if counts[source_key]:
+            state = 'loaded'
+        elif crawl_status['state'] == CrawlState.RUNNING.value:
+            state = 'loading'
+        else:
+            state = 'empty'
+        sources[source_key] = {
+            'source': SOURCE_NAMES.get(source_key, source_key),
+            'status': state,
+            'count': counts[source_key],
+            'crawl_status': crawl_status,
+        }
+    
+    states = {info['status'] for info in sources.values()}
+    overall = next(state for state in ('loaded', 'loading', 'empty') if state in states)
+    logger.info(f"[batch] Serving {len(articles_data)} articles for {date_str} ({', '.join(source_keys)})")
+    
+    response = {
+        'date': date_str,
+        'status': overall,
+        'sources': sources,
+        'data': articles_data
+    }
+    if error:
+        response['error'] = error
+    return jsonify(response)
 
 @app.route('/api/news/<source_key>')
 def get_news(source_key):
@@ -597,29 +768,16 @@ def get_news(source_key):
         return jsonify({'error': 'Invalid source'}), 400
     
     status = CRAWL_STATUS[source_key]
-    
-    source_names = {
-        'fujian': '福建日报',
-        'hainan': '海南日报',
-        'nanfang': '南方日报',
-        'guangzhou': '广州日报',
-        'guangxi': '广西日报'
-    }
+    source_names = SOURCE_NAMES
     
     # Try to get from database first
     try:
-        articles = get_articles_by_date(source_key=source_key, date_str=date_str)
+        # Column-projected rows, already plain dicts (no ORM objects)
+        articles_data = get_article_rows(source_key=source_key, date_str=date_str)
         
-        if articles and len(articles) > 0:
+        if articles_data:
             # Found data in database - return loaded state
-            logger.info(f"[{source_key}] Serving {len(articles)} articles from database for {date_str}")
-            
-            # Convert to dict format
-            articles_data = [article.to_dict() for article in articles]
-            
-            # Mark starred items
-            for item in articles_data:
-                item['starred'] = item['link'] in STARRED_ITEMS
+            logger.info(f"[{source_key}] Serving {len(articles_data)} articles from database for {date_str}")
             
             return jsonify({
                 'source': source_names.get(source_key, source_key),
@@ -660,6 +818,56 @@ def get_news(source_key):
         })
 
 
+@app.route('/api/search')
+def search_news():
+    """
+    Full-text search over stored articles.
+    
+    Titles, translated titles and previews are searched; article bodies
+    are not indexed.
+    
+    Query params: q (required), source, date_from, date_to (YYYY-MM-DD),
+    page (default 1), per_page (default 20, max 100)
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Missing query'}), 400
+    
+    source_key = request.args.get('source') or None
+    if source_key and source_key not in CRAWL_STATUS:
+        return jsonify({'error': 'Invalid source'}), 400
+    
+    date_from = request.args.get('date_from') or None
+    date_to = request.args.get('date_to') or None
+    for value in (date_from, date_to):
+        if value:
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                return jsonify({'error': 'Invalid date format'}), 400
+    
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    
+    try:
+        rows, total = search_articles(
+            query, source_key=source_key, date_from=date_from, date_to=date_to,
+            page=page, per_page=per_page
+        )
+    except Exception as e:
+        logger.error(f"Search error for '{query}': {e}")
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({
+        'status': 'success',
+        'query': query,
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'data': rows
+    })
+
+
 def get_news_realtime(source_key, current_date, date_str, status=None):
     """Original real-time crawling logic (fallback when DB is empty).
     
@@ -682,8 +890,8 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
         if status:
             status.add_log(msg)
     
-    session = requests.Session()
-    session.headers.update({'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'})
+    # All requests share the pooled, concurrency-capped fetch engine
+    engine = get_engine()
     
     try:
         all_news_items = []
@@ -697,7 +905,7 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
             start_url = f"{root_url}node_01.html"
             
             # 1. Fetch first page to get the list of pages
-            resp = session.get(start_url, timeout=10)
+            resp = engine.get(start_url, headers=CRAWL_HEADERS, timeout=10)
             if resp.status_code == 404:
                  log_message("No data available for this date (404)")
                  return {'source': source_name, 'status': 'success', 'data': []}
@@ -727,7 +935,7 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
             root_url = f"http://news.hndaily.cn/html/{dates['yyyy-mm']}/{dates['dd']}/"
             start_url = f"{root_url}node_1.htm"
             
-            resp = session.get(start_url, timeout=10)
+            resp = engine.get(start_url, headers=CRAWL_HEADERS, timeout=10)
             if resp.status_code == 404:
                  log_message("No data available for this date (404)")
                  return {'source': source_name, 'status': 'success', 'data': []}
@@ -756,42 +964,38 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
             log_message(f"Starting to crawl Nanfang Daily for {date_str}")
             
             try:
-                # Use the verified parser from nanfang_live module
-                log_message("Fetching sections A01-A08...")
+                # Use the verified parser from nanfang_live module; the section
+                # list is read from the edition's own navigation
+                log_message("Discovering sections...")
+                sections = fetch_nanfang_edition(current_date)
+                log_message(f"Found {len(sections)} sections")
                 
-                # Fetch core sections A01-A08 (要闻/广东/时政等主版面)
-                # A09/A10 are mostly supplements/ads and can cause SSL timeout issues
-                for section_num in range(1, 9):  # A01 through A08
-                    section_code = f"A{section_num:02d}"
+                for section_code, raw_articles in sections:
+                    if isinstance(raw_articles, Exception):
+                        # 404 is expected for non-existent sections
+                        if "404" not in str(raw_articles):
+                            log_message(f"Error in section {section_code}: {str(raw_articles)[:50]}")
+                        continue
+                    
+                    # DEBUG: Log results for A01
+                    if section_code == "A01":
+                        log_message(f"Section {section_code}: found {len(raw_articles)} articles")
                     
-                    try:
-                        # Use the verified fetch_nanfang_articles function
-                        raw_articles = fetch_nanfang_articles(current_date, section=section_code)
+                    # Convert to our format and translate
+                    section_name = f"第{section_code}版"
+                    for item in raw_articles:
+                        title = item['title']
+                        url = item['url']
                         
-                        # DEBUG: Log results for A01
-                        if section_code == "A01":
-                            log_message(f"Section {section_code}: found {len(raw_articles)} articles")
+                        # Translate title
+                        title_ko = translate_text(title)
                         
-                        # Convert to our format and translate
-                        section_name = f"第{section_code}版"
-                        for item in raw_articles:
-                            title = item['title']
-                            url = item['url']
-                            
-                            # Translate title
-                            title_ko = translate_text(title)
-                            
-                            all_news_items.append({
-                                'title': title,
-                                'title_ko': title_ko,
-                                'link': url,
-                                'section': section_name
-                            })
-                    except Exception as e:
-                        # 404 is expected for non-existent sections
-                        if "404" not in str(e):
-                            log_message(f"Error in section {section_code}: {str(e)[:50]}")
-                        continue
+                        all_news_items.append({
+                            'title': title,
+                            'title_ko': title_ko,
+                            'link': url,
+                            'section': section_name
+                        })
                 
                 log_message(f"✓ Completed: {len(all_news_items)} articles found")
                 
@@ -809,62 +1013,27 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
                 
                 html = fetch_html(index_url)
                 
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # PC version structure: find section links
-                # Look for links to section pages (node_XXX.htm)
-                section_links = soup.select('a[href*="node_"]')
-                
                 # Build a map of section URLs to section names
-                section_map = {}
-                for section_link in section_links:
-                    section_href = section_link.get('href')
-                    section_text = section_link.get_text(strip=True)
-                    if section_href and 'node_' in section_href:
-                        # Build absolute URL
-                        if section_href.startswith('http'):
-                            abs_url = section_href
-                        else:
-                            # For PC version, construct the full path
-                            date_path = current_date.strftime("%Y-%m/%d")
-                            abs_url = f"https://gzdaily.dayoo.com/pc/html/{date_path}/{section_href}"
-                        section_map[abs_url] = section_text if section_text else "未知版面"
+                section_map = parse_gzdaily_index(html, current_date)
                 
                 log_message(f"Found {len(section_map)} sections")
                 
-                # Now fetch each section page to get article titles
-                for section_url, section_name in section_map.items():
-                    try:
-                        section_html = fetch_html(section_url)
-                        section_soup = BeautifulSoup(section_html, 'html.parser')
-                        
-                        # Find article links - PC version uses area tags with data-title
-                        article_areas = section_soup.select('area[data-title]')
-                        
-                        for area in article_areas:
-                            title = area.get('data-title', '').strip()
-                            href = area.get('href')
-                            
-                            if href and title and len(title) > 3:
-                                # Build absolute URL
-                                if href.startswith('http'):
-                                    abs_link = href
-                                else:
-                                    date_path = current_date.strftime("%Y-%m/%d")
-                                    abs_link = f"https://gzdaily.dayoo.com/pc/html/{date_path}/{href}"
-                                
-                                # Translate title
-                                title_ko = translate_text(title)
-                                
-                                all_news_items.append({
-                                    'title': title,
-                                    'title_ko': title_ko,
-                                    'link': abs_link,
-                                    'section': section_name
-                                })
-                    except Exception as e:
-                        log_message(f"Error in section: {str(e)[:50]}")
+                # Fetch and parse all section pages concurrently (order preserved)
+                for section_name, articles in fetch_gzdaily_sections(current_date, section_map):
+                    if isinstance(articles, Exception):
+                        log_message(f"Error in section: {str(articles)[:50]}")
                         continue
+                    
+                    for article in articles:
+                        # Translate title
+                        title_ko = translate_text(article['title'])
+                        
+                        all_news_items.append({
+                            'title': article['title'],
+                            'title_ko': title_ko,
+                            'link': article['url'],
+                            'section': section_name
+                        })
                 
                 log_message(f"✓ Completed: {len(all_news_items)} articles found")
                 
@@ -873,7 +1042,6 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
 
         elif source_key == 'guangxi':
             source_name = "广西日报"
-            base_url = "https://gxrb.gxrb.com.cn/"
             date_param = date_str if date_str else current_date.strftime('%Y-%m-%d')
             
             log_message(f"Starting to crawl Guangxi Daily for {date_param}")
@@ -881,67 +1049,27 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
             # Guangxi Daily: Fetch individual articles using Playwright
             # URL pattern: ?name=gxrb&date=YYYY-MM-DD&code=XXX&xuhao=N
             # code: section (001-009), xuhao: article number (1-10)
+            # Article lists come from each section's captured JSON; sections
+            # without data are probed concurrently, bounded per host
+            resource_stats = ResourceStats()
+            articles = probe_guangxi_edition(
+                date_param,
+                lambda url: fetch_guangxi_article(url, stats=resource_stats),
+                discover_section=lambda date, code: discover_guangxi_section(date, code, stats=resource_stats),
+                log=log_message
+            )
+            log_message(resource_stats.summary())
             
-            for section_num in range(1, 10):  # Sections 001-009
-                code = f"{section_num:03d}"
-                section_name = f"第{code}版"
-                
-                articles_found_in_section = 0
-                consecutive_failures = 0
+            for article in articles:
+                # Translate title
+                title_ko = translate_text(article['title'])
                 
-                log_message(f"Fetching section {code}...")
-                
-                for article_num in range(1, 11):  # Articles 1-10 per section
-                    article_url = f"{base_url}?name=gxrb&date={date_param}&code={code}&xuhao={article_num}"
-                    
-                    try:
-                        article_data = fetch_guangxi_article_with_playwright(article_url)
-                        
-                        if not article_data or not article_data.get('title'):
-                            # No article found at this position
-                            consecutive_failures += 1
-                            
-                            # If we've had 3 consecutive failures, assume no more articles in this section
-                            if consecutive_failures >= 3:
-                                log_message(f"No more articles in section {code}")
-                                break
-                            continue
-                        
-                        # Reset consecutive failures counter
-                        consecutive_failures = 0
-                        
-                        title = article_data['title']
-                        
-                        # Skip if title is too short or looks like navigation
-                        if len(title) < 5:
-                            continue
-                        
-                        # Translate title
-                        title_ko = translate_text(title)
-                        
-                        all_news_items.append({
-                            'title': title,
-                            'title_ko': title_ko,
-                            'link': article_url,
-                            'section': section_name
-                        })
-                        
-                        articles_found_in_section += 1
-                        
-                    except Exception as e:
-                        log_message(f"Error in article: {str(e)[:50]}")
-                        consecutive_failures += 1
-                        # Continue trying other articles even if one fails
-                        if consecutive_failures >= 3:
-                            log_message(f"Too many errors in section {code}")
-                            break
-                        continue
-                
-                if articles_found_in_section > 0:
-                    log_message(f"Section {code}: {articles_found_in_section} articles")
-                
-                # Don't break - continue checking all sections even if some are empty
-                # Some sections might be empty but later sections could have content
+                all_news_items.append({
+                    'title': article['title'],
+                    'title_ko': title_ko,
+                    'link': article['url'],
+                    'section': f"第{article['code']}版"
+                })
             
             log_message(f"✓ Completed: {len(all_news_items)} articles found")
 
@@ -950,18 +1078,21 @@ def get_news_realtime(source_key, current_date, date_str, status=None):
             
         # 2. Fetch all pages concurrently
         log_message(f"Fetching {len(pages_to_fetch)} pages with articles...")
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_url = {executor.submit(fetch_page_items, session, url, source_type=source_key, section_name=section): url for url, section in pages_to_fetch}
-            for future in as_completed(future_to_url):
-                items = future.result()
-                all_news_items.extend(items)
+        responses = engine.get_many([url for url, _ in pages_to_fetch], headers=CRAWL_HEADERS, timeout=10)
+        for (url, section), resp in zip(pages_to_fetch, responses):
+            if isinstance(resp, Exception):
+                logging.error(f"Error fetching page {url}: {resp}")
+                continue
+            resp.encoding = 'utf-8'
+            all_news_items.extend(parse_page_items(resp.text, url, source_type=source_key, section_name=section))
         
         # Sort by section to maintain order (01, 02, 03...)
         all_news_items.sort(key=lambda x: x.get('section', ''))
         
-        # Mark starred items
+        # Mark starred items (one IN query for the whole page)
+        starred = starred_links(item['link'] for item in all_news_items)
         for item in all_news_items:
-            item['starred'] = item['link'] in STARRED_ITEMS
+            item['starred'] = item['link'] in starred
         
         return {
             'source': source_name,
@@ -996,6 +1127,25 @@ def scheduler_status():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/admin/cache')
+def cache_status():
+    """Get article cache counters and in-flight fetch deduplication counters."""
+    return jsonify({
+        'status': 'success',
+        'article_cache': ARTICLE_CACHE.stats(),
+        'article_fetches': ARTICLE_FLIGHTS.stats()
+    })
+
+
+@app.route('/api/admin/prefetch')
+def prefetch_status():
+    """Get article fetch pool queue depth and counters."""
+    return jsonify({
+        'status': 'success',
+        'prefetch': ARTICLE_FETCH_POOL.stats()
+    })
+
+
 @app.route('/api/admin/trigger/<job_id>', methods=['POST'])
 def trigger_job(job_id):
     """Manually trigger a scheduled job."""
@@ -1,21 +1,41 @@
 """Database package initialization."""
-from database.models import Article, Base
+from database.models import Article, SourceStats, ArticleBody, BodyDict, StarredItem, Base
 from database.db import (
     init_db,
     get_session,
     save_articles,
     get_articles_by_date,
+    get_article_rows,
+    search_articles,
+    rebuild_search_index,
+    save_article_body,
+    get_article_body,
+    set_starred,
+    get_starred_since,
+    starred_links,
     cleanup_old_articles,
     get_stats
 )
 
 __all__ = [
     'Article',
+    'SourceStats',
+    'ArticleBody',
+    'BodyDict',
+    'StarredItem',
     'Base',
     'init_db',
     'get_session',
     'save_articles',
     'get_articles_by_date',
+    'get_article_rows',
+    'search_articles',
+    'rebuild_search_index',
+    'save_article_body',
+    'get_article_body',
+    'set_starred',
+    'get_starred_since',
+    'starred_links',
     'cleanup_old_articles',
     'get_stats'
 ]
@@ -0,0 +1,88 @@
+"""
+Compressed storage for full article bodies.
+
+Bodies (cleaned HTML plus extracted paragraphs) are serialized as JSON and
+deflated with zlib. Articles from the same newspaper share most of their
+markup and boilerplate, so compression uses a preset dictionary built from
+stored bodies: once enough bodies exist, train_dictionary() collects byte
+segments that recur across many documents and packs them into zlib's 32 KB
+window. Each body records the id of the dictionary it was written with
+(0 = none), so older rows stay readable after a new dictionary is trained.
+
+The standard library has no dictionary trainer (zstd's is not available
+without a new dependency), hence the simple document-frequency heuristic.
+"""
+import json
+import zlib
+from collections import Counter
+
+COMPRESSION_LEVEL = 9
+
+# zlib only looks back 32 KB, so a larger dictionary is wasted
+DICT_SIZE = 32 * 1024
+
+# Segment length and stride used when looking for shared content
+SEGMENT_LENGTH = 24
+SEGMENT_STEP = 2
+
+# Only the head of each sample is scanned, bounding training cost
+SAMPLE_BYTES = 8 * 1024
+
+
+def encode_body(body):
+    """Serialize a body dict ({'content_cn', 'content_ko'}) to bytes."""
+    return json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def decode_body(data):
+    return json.loads(data.decode('utf-8'))
+
+
+def compress(data, zdict=None):
+    if zdict:
+        compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(COMPRESSION_LEVEL)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress(data, zdict=None):
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+def train_dictionary(samples, size=DICT_SIZE):
+    """
+    Build a zlib preset dictionary from sample documents.
+
+    Segments are ranked by how many samples contain them; the most common
+    ones are placed at the end of the dictionary, where zlib can reference
+    them with the shortest distances.
+
+    Args:
+        samples: Iterable of bytes (encoded bodies)
+        size: Maximum dictionary size in bytes
+
+    Returns:
+        Dictionary bytes (empty if nothing recurs)
+    """
+    doc_freq = Counter()
+    for sample in samples:
+        head = sample[:SAMPLE_BYTES]
+        doc_freq.update({
+            head[i:i + SEGMENT_LENGTH]
+            for i in range(0, max(len(head) - SEGMENT_LENGTH, 0), SEGMENT_STEP)
+        })
+
+    picked = []
+    total = 0
+    for segment, freq in doc_freq.most_common():
+        if freq < 2 or total + len(segment) > size:
+            break
+        # Overlapping segments of the same boilerplate add little
+        if any(segment in chosen for chosen in picked[-64:]):
+            continue
+        picked.append(segment)
+        total += len(segment)
+
+    return b''.join(reversed(picked))
@@ -1,32 +1,132 @@
 """Database initialization and helper functions."""
 import os
+import gzip
+import json
+import time
+import logging
+import threading
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, select, text, func, and_, outerjoin
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.exc import IntegrityError
-from database.models import Base, Article
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database.models import Base, Article, SourceStats, ArticleBody, BodyDict, StarredItem
+from database import bodies
+from database.search import ensure_search_index, index_articles, build_match_query, search_query_sql
+from database import search
+
+logger = logging.getLogger(__name__)
 
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'news.db')
 DB_URL = f'sqlite:///{DB_PATH}'
 
+# SQLite tuning, applied to every new connection. WAL lets API readers
+# keep working while the scheduler commits a crawl.
+DB_JOURNAL_MODE = os.environ.get('DB_JOURNAL_MODE', 'WAL')
+DB_SYNCHRONOUS = os.environ.get('DB_SYNCHRONOUS', 'NORMAL')
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', '5000'))
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', str(256 * 1024 * 1024)))
+DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', '32768'))
+# NONE, FULL or INCREMENTAL; existing databases are converted by
+# scripts/convert_auto_vacuum.py (a full VACUUM, run while the app is stopped)
+DB_AUTO_VACUUM = os.environ.get('DB_AUTO_VACUUM', 'INCREMENTAL').upper()
+
+# Connection pool shared by Flask request threads and crawl threads
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '8'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '30'))
+
+# Rows per executemany batch in save_articles
+UPSERT_CHUNK_SIZE = int(os.environ.get('DB_UPSERT_CHUNK_SIZE', '500'))
+
+# Crawled fields that only overwrite stored values when present
+UPSERT_OPTIONAL_COLUMNS = ('title_ko', 'section', 'content_preview')
+
+# Train a body compression dictionary once this many bodies are stored
+# without one (0 disables training)
+BODY_DICT_MIN_SAMPLES = int(os.environ.get('DB_BODY_DICT_MIN_SAMPLES', '50'))
+
+# Batched cleanup: rows per transaction, pause between transactions
+# (seconds) and pages released per incremental_vacuum step
+CLEANUP_CHUNK_SIZE = int(os.environ.get('DB_CLEANUP_CHUNK_SIZE', '500'))
+CLEANUP_PAUSE = float(os.environ.get('DB_CLEANUP_PAUSE', '0.05'))
+CLEANUP_VACUUM_PAGES = int(os.environ.get('DB_CLEANUP_VACUUM_PAGES', '1000'))
+
+# Archive expired rows to compressed monthly files before deleting them
+CLEANUP_ARCHIVE = os.environ.get('DB_CLEANUP_ARCHIVE', '0') == '1'
+ARCHIVE_DIR = os.environ.get(
+    'DB_ARCHIVE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'archive')
+)
+
+# Columns returned by get_article_rows (what the news list renders)
+LISTING_COLUMNS = ('source', 'source_key', 'section', 'title', 'title_ko', 'link', 'date')
+
 # Create engine and session factory
 engine = None
 Session = None
 
 
-def init_db():
-    """Initialize database and create tables if they don't exist."""
-    global engine, Session
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure each new SQLite connection (journal, sync, caches)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        # Only takes effect on a new, empty database (see convert_auto_vacuum)
+        cursor.execute(f"PRAGMA auto_vacuum={DB_AUTO_VACUUM}")
+        cursor.execute(f"PRAGMA journal_mode={DB_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size={-DB_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def init_db(db_path=None):
+    """
+    Initialize database and create tables if they don't exist.
+    
+    Args:
+        db_path: Optional database file (default: data/news.db); used by
+            tests and benchmarks to work on a throwaway database
+    """
+    global engine, Session, DB_PATH, DB_URL
+    
+    if db_path is not None:
+        DB_PATH = db_path
+        DB_URL = f'sqlite:///{DB_PATH}'
     
     # Ensure data directory exists
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     
-    # Create engine
-    engine = create_engine(DB_URL, echo=False)
+    # Create engine; connections are shared across threads through the
+    # pool, so sqlite3's same-thread check is disabled
+    engine = create_engine(
+        DB_URL,
+        echo=False,
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        connect_args={
+            'check_same_thread': False,
+            'timeout': DB_BUSY_TIMEOUT_MS / 1000,
+        },
+    )
+    event.listen(engine, 'connect', _apply_sqlite_pragmas)
+    _body_dicts.clear()
     
     # Create all tables
     Base.metadata.create_all(engine)
+    migrate_schema(engine)
+    _check_auto_vacuum(engine)
+    with engine.begin() as conn:
+        if ensure_search_index(conn):
+            print("✓ Full-text search index built")
     
     # Create session factory
     Session = scoped_session(sessionmaker(bind=engine))
@@ -35,6 +135,72 @@ def init_db():
     return engine
 
 
+def migrate_schema(db_engine):
+    """
+    Bring indexes of an existing database in line with the models.
+    
+    create_all() only creates missing tables, so index changes on the
+    articles table are applied here. Every statement is idempotent.
+    """
+    with db_engine.begin() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_source_date ON articles (source_key, date)"))
+        # Superseded by idx_source_date / the UNIQUE(link) constraint
+        conn.execute(text("DROP INDEX IF EXISTS idx_source"))
+        conn.execute(text("DROP INDEX IF EXISTS idx_link"))
+        
+        # Backfill source_stats for databases created before it existed
+        has_stats = conn.execute(text("SELECT 1 FROM source_stats LIMIT 1")).first()
+        if not has_stats:
+            conn.execute(text(
+                "INSERT INTO source_stats (source_key, date, count, last_updated) "
+                "SELECT source_key, date, COUNT(*), MAX(last_updated) FROM articles "
+                "GROUP BY source_key, date"
+            ))
+
+
+_AUTO_VACUUM_MODES = {'NONE': 0, 'FULL': 1, 'INCREMENTAL': 2}
+
+
+def _check_auto_vacuum(db_engine):
+    """Warn if an existing database still needs convert_auto_vacuum()."""
+    wanted = _AUTO_VACUUM_MODES.get(DB_AUTO_VACUUM)
+    with db_engine.connect() as conn:
+        current = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+    if wanted is not None and current != wanted:
+        logger.warning(
+            f"✗ Database uses auto_vacuum={current}, wanted {DB_AUTO_VACUUM}; "
+            "run scripts/convert_auto_vacuum.py while the app is stopped"
+        )
+
+
+def convert_auto_vacuum(db_engine=None):
+    """
+    Switch an existing database to DB_AUTO_VACUUM (a one-off full VACUUM).
+    
+    Rewrites the whole file, so it is not run at startup (every gunicorn
+    worker would attempt it); see scripts/convert_auto_vacuum.py.
+    
+    Returns:
+        True if the database was converted, False if already in that mode
+    """
+    if db_engine is None:
+        db_engine = engine if engine is not None else init_db()
+    wanted = _AUTO_VACUUM_MODES.get(DB_AUTO_VACUUM)
+    if wanted is None:
+        raise ValueError(f"Invalid DB_AUTO_VACUUM: {DB_AUTO_VACUUM}")
+    
+    # VACUUM cannot run inside a transaction
+    with db_engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == wanted:
+            return False
+        
+        logger.info(f"Converting database to auto_vacuum={DB_AUTO_VACUUM} (one-off VACUUM)...")
+        conn.exec_driver_sql(f"PRAGMA auto_vacuum={DB_AUTO_VACUUM}")
+        conn.exec_driver_sql("VACUUM")
+        logger.info("✓ Database converted")
+        return True
+
+
 def get_session():
     """Get a database session."""
     if Session is None:
@@ -42,10 +208,51 @@ def get_session():
     return Session()
 
 
+def _article_row(article_data, source_key, date_str, now):
+    """Build the INSERT values for one crawled article."""
+    return {
+        'source': article_data.get('source', ''),
+        'source_key': source_key,
+        'section': article_data.get('section', ''),
+        'title': article_data['title'],
+        'title_ko': article_data.get('title_ko', ''),
+        'link': article_data['link'],
+        'content_preview': article_data.get('content_preview', ''),
+        'date': date_str,
+        'last_updated': now,
+        'created_at': now,
+    }
+
+
+def _upsert_statement(update_columns):
+    """INSERT ... ON CONFLICT(link) DO UPDATE for the given columns."""
+    stmt = sqlite_insert(Article.__table__)
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    set_['last_updated'] = stmt.excluded.last_updated
+    return stmt.on_conflict_do_update(index_elements=['link'], set_=set_)
+
+
+def _refresh_source_stats(conn, source_key, date_str):
+    """Recount one (source_key, date) row of source_stats from articles (indexed)."""
+    conn.execute(text(
+        "INSERT INTO source_stats (source_key, date, count, last_updated) "
+        "SELECT source_key, date, COUNT(*), MAX(last_updated) FROM articles "
+        "WHERE source_key = :source_key AND date = :date GROUP BY source_key, date "
+        "ON CONFLICT(source_key, date) DO UPDATE SET "
+        "count = excluded.count, last_updated = excluded.last_updated"
+    ), {'source_key': source_key, 'date': date_str})
+
+
 def save_articles(articles_data, source_key, date_str):
     """
     Save multiple articles to database.
     
+    Articles are written with SQLite's INSERT ... ON CONFLICT(link) DO UPDATE
+    in executemany chunks of UPSERT_CHUNK_SIZE rows, so no per-article
+    lookup is needed. On conflict only the fields present in the crawled
+    dict are overwritten (plus last_updated); source, source_key and date
+    of an existing article are kept.
+    
     Args:
         articles_data: List of article dicts from crawler
         source_key: Source identifier (e.g., 'fujian')
@@ -54,56 +261,92 @@ def save_articles(articles_data, source_key, date_str):
     Returns:
         Tuple of (success_count, error_count)
     """
-    session = get_session()
+    if engine is None:
+        init_db()
+    
     success_count = 0
     error_count = 0
+    now = datetime.utcnow()
+    
+    # Rows are grouped by which optional fields they carry, because a
+    # missing field must keep the stored value instead of being blanked
+    groups = {}
+    for article_data in articles_data:
+        update_columns = ('title',) + tuple(
+            key for key in UPSERT_OPTIONAL_COLUMNS if key in article_data
+        )
+        groups.setdefault(update_columns, []).append(
+            _article_row(article_data, source_key, date_str, now)
+        )
     
     try:
-        for article_data in articles_data:
-            try:
-                # Check if article already exists
-                existing = session.query(Article).filter_by(link=article_data['link']).first()
-                
-                if existing:
-                    # Update existing article
-                    existing.title = article_data.get('title', existing.title)
-                    existing.title_ko = article_data.get('title_ko', existing.title_ko)
-                    existing.section = article_data.get('section', existing.section)
-                    existing.content_preview = article_data.get('content_preview', existing.content_preview)
-                    existing.last_updated = datetime.utcnow()
-                else:
-                    # Create new article
-                    article = Article(
-                        source=article_data.get('source', ''),
-                        source_key=source_key,
-                        section=article_data.get('section', ''),
-                        title=article_data['title'],
-                        title_ko=article_data.get('title_ko', ''),
-                        link=article_data['link'],
-                        content_preview=article_data.get('content_preview', ''),
-                        date=date_str
-                    )
-                    session.add(article)
-                
-                success_count += 1
+        with engine.begin() as conn:
+            for update_columns, rows in groups.items():
+                stmt = _upsert_statement(update_columns)
                 
-            except IntegrityError:
-                session.rollback()
-                error_count += 1
-                continue
-        
-        session.commit()
+                for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                    chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+                    try:
+                        conn.execute(stmt, chunk)
+                        success_count += len(chunk)
+                    except IntegrityError:
+                        # Retry row by row so one bad article does not drop
+                        # the chunk; upserts are idempotent, so rows already
+                        # applied before the failure are simply rewritten
+                        for row in chunk:
+                            try:
+                                conn.execute(stmt, row)
+                                success_count += 1
+                            except IntegrityError:
+                                error_count += 1
+            
+            # Keep search and get_stats() in step, in the same transaction
+            index_articles(conn, (row['link'] for rows in groups.values() for row in rows))
+            _refresh_source_stats(conn, source_key, date_str)
         
     except Exception as e:
-        session.rollback()
         print(f"✗ Error saving articles: {e}")
         raise
-    finally:
-        session.close()
     
     return success_count, error_count
 
 
+def articles_query(source_key=None, date_str=None, columns=None, starred=False):
+    """
+    Build the SELECT used by get_articles_by_date / get_article_rows.
+    
+    With both filters set it is answered from idx_source_date without a
+    sort step (see test_query_plan.py).
+    
+    Args:
+        source_key: Optional source filter; a list/tuple selects several
+            sources (source_key IN (...))
+        columns: Optional list of Article columns to project (default: entity)
+        starred: Add a boolean 'starred' column, from a LEFT JOIN on
+            starred_items (one primary key lookup per row)
+    """
+    query = select(*columns) if columns else select(Article)
+    
+    if starred:
+        query = query.add_columns(
+            StarredItem.link.isnot(None).label('starred')
+        ).select_from(outerjoin(
+            Article, StarredItem,
+            and_(StarredItem.link == Article.link, StarredItem.starred.is_(True))
+        ))
+    
+    if isinstance(source_key, (list, tuple)):
+        query = query.where(Article.source_key.in_(source_key))
+    elif source_key:
+        query = query.where(Article.source_key == source_key)
+    
+    if date_str:
+        query = query.where(Article.date == date_str)
+    
+    # Order by date desc, then by source
+    return query.order_by(Article.date.desc(), Article.source_key)
+
+
 def get_articles_by_date(source_key=None, date_str=None):
     """
     Retrieve articles from database.
@@ -118,73 +361,491 @@ def get_articles_by_date(source_key=None, date_str=None):
     session = get_session()
     
     try:
-        query = session.query(Article)
+        return session.scalars(articles_query(source_key, date_str)).all()
         
-        if source_key:
-            query = query.filter(Article.source_key == source_key)
+    finally:
+        session.close()
+
+
+def get_article_rows(source_key=None, date_str=None):
+    """
+    Lightweight listing read: only the LISTING_COLUMNS, as plain dicts.
+    
+    Skips ORM hydration and to_dict(), which dominate the cost of
+    /api/news when a day has hundreds of articles.
+    
+    Args:
+        source_key: Optional source filter (e.g., 'fujian'), or a list of
+            sources to read them all in one query
+        date_str: Optional date filter in YYYY-MM-DD format
+    
+    Returns:
+        List of dicts keyed by column name, plus 'starred'
+    """
+    if engine is None:
+        init_db()
+    
+    query = articles_query(
+        source_key, date_str, columns=[getattr(Article, c) for c in LISTING_COLUMNS], starred=True
+    )
+    with engine.connect() as conn:
+        return [dict(row) for row in conn.execute(query).mappings()]
+
+
+def search_articles(query, source_key=None, date_from=None, date_to=None, page=1, per_page=20):
+    """
+    Full-text search over titles, translations and previews (FTS5, bm25).
+    
+    Args:
+        query: Search terms; each term matches as a substring, terms are ANDed
+        source_key: Optional source filter (e.g., 'fujian')
+        date_from: Optional first date (YYYY-MM-DD, inclusive)
+        date_to: Optional last date (YYYY-MM-DD, inclusive)
+        page: 1-based page number
+        per_page: Results per page
+    
+    Returns:
+        Tuple of (rows, total): rows are dicts with the LISTING_COLUMNS plus
+        'starred' and 'score' (lower is better), total is the number of matches
+    """
+    if engine is None:
+        init_db()
+    
+    match = build_match_query(query or '')
+    if match is None:
+        return [], 0
+    
+    select_sql, count_sql = search_query_sql(source_key, date_from, date_to)
+    params = {
+        'match': match,
+        'source_key': source_key,
+        'date_from': date_from,
+        'date_to': date_to,
+        'limit': per_page,
+        'offset': (max(page, 1) - 1) * per_page,
+    }
+    
+    with engine.connect() as conn:
+        total = conn.execute(text(count_sql), params).scalar()
+        rows = [dict(row) for row in conn.execute(text(select_sql), params).mappings()]
+    for row in rows:
+        row['starred'] = bool(row['starred'])
+    return rows, total
+
+
+def rebuild_search_index():
+    """
+    Re-index every article.
+    
+    save_articles keeps the index current; run this after inserting or
+    editing articles by other means (sqlite3 CLI, restores, scripts).
+    Deletes from any writer are handled by a trigger.
+    """
+    if engine is None:
+        init_db()
+    
+    with engine.begin() as conn:
+        search.rebuild_search_index(conn)
+    logger.info("✓ Full-text search index rebuilt")
+
+
+# Links per IN (...) query in starred_links
+STARRED_LOOKUP_CHUNK = 500
+
+
+def set_starred(link, starred, item=None):
+    """
+    Star or unstar an article.
+    
+    Every write takes the next value of the change cursor (seq), so
+    clients can fetch just the changes since their last read. Unstarring
+    keeps the row as a tombstone (starred = 0) so those clients learn about
+    the removal.
+    
+    A link is only added to the selection together with its item data;
+    without it (or when unstarring) only an existing row is updated.
+    
+    Args:
+        link: Article URL
+        starred: True to add to the selection, False to remove
+        item: Listing item to show on the selection page (kept from an
+            earlier star if omitted)
+    
+    Returns:
+        The new cursor value, or None if nothing was recorded
+    """
+    if engine is None:
+        init_db()
+    
+    item = dict(item or {})
+    item.pop('starred', None)
+    table = StarredItem.__table__
+    
+    # Next cursor value, computed inside the statement so it is taken
+    # under the write lock even with several processes writing
+    next_seq = select(func.coalesce(func.max(table.c.seq), 0) + 1).scalar_subquery()
+    
+    with engine.begin() as conn:
+        if not (starred and item):
+            updated = conn.execute(
+                table.update()
+                .where(table.c.link == link)
+                .values(starred=bool(starred), seq=next_seq, updated_at=datetime.utcnow())
+            ).rowcount
+            if not updated:
+                return None
+            return conn.execute(select(table.c.seq).where(table.c.link == link)).scalar()
         
-        if date_str:
-            query = query.filter(Article.date == date_str)
+        stmt = sqlite_insert(table).values(
+            link=link,
+            item=json.dumps(item, ensure_ascii=False),
+            starred=True,
+            seq=next_seq,
+            source_key=item.get('source_key') or item.get('sourceKey'),
+            date=item.get('date'),
+            updated_at=datetime.utcnow(),
+        )
+        excluded = stmt.excluded
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=['link'],
+            set_={
+                'item': excluded.item,
+                'starred': excluded.starred,
+                'seq': excluded.seq,
+                'source_key': func.coalesce(excluded.source_key, table.c.source_key),
+                'date': func.coalesce(excluded.date, table.c.date),
+                'updated_at': excluded.updated_at,
+            }
+        ))
+        return conn.execute(select(table.c.seq).where(table.c.link == link)).scalar()
+
+
+def get_starred_since(since=0):
+    """
+    Read the selection, or only what changed after a cursor.
+    
+    Args:
+        since: Cursor from an earlier call (0 = full selection)
+    
+    Returns:
+        Dict with 'items' (starred items, oldest first), 'removed' (links
+        unstarred since the cursor), 'cursor' (pass back as since) and
+        'full' (True if items is the whole selection, e.g. because the
+        cursor is unknown after the database was reset)
+    """
+    if engine is None:
+        init_db()
+    
+    table = StarredItem.__table__
+    with engine.connect() as conn:
+        cursor = conn.execute(select(func.coalesce(func.max(table.c.seq), 0))).scalar()
+        full = not since or since > cursor
         
-        # Order by date desc, then by source
-        query = query.order_by(Article.date.desc(), Article.source_key)
+        query = select(table.c.link, table.c.item, table.c.starred, table.c.seq)
+        if full:
+            query = query.where(table.c.starred.is_(True), table.c.item.isnot(None))
+        else:
+            query = query.where(table.c.seq > since)
+        rows = conn.execute(query.where(table.c.seq <= cursor).order_by(table.c.seq)).all()
+    
+    items, removed = [], []
+    for link, item, starred, _ in rows:
+        if not starred or not item:
+            removed.append(link)
+            continue
+        data = json.loads(item)
+        data['starred'] = True
+        items.append(data)
+    
+    return {'items': items, 'removed': removed, 'cursor': cursor, 'full': full}
+
+
+def starred_links(links):
+    """
+    Return the subset of links that are currently starred.
+    
+    For items that are not read from the articles table (realtime
+    crawls), where the listing JOIN does not apply.
+    """
+    if engine is None:
+        init_db()
+    
+    links = list(dict.fromkeys(links))
+    found = set()
+    with engine.connect() as conn:
+        for i in range(0, len(links), STARRED_LOOKUP_CHUNK):
+            chunk = links[i:i + STARRED_LOOKUP_CHUNK]
+            found.update(conn.execute(
+                select(StarredItem.link).where(
+                    StarredItem.link.in_(chunk), StarredItem.starred.is_(True)
+                )
+            ).scalars())
+    return found
+
+
+# Body compression dictionaries by id (immutable once written)
+_body_dicts = {}
+_body_dicts_lock = threading.Lock()
+
+
+def _load_body_dict(conn, dict_id):
+    if not dict_id:
+        return None
+    with _body_dicts_lock:
+        if dict_id not in _body_dicts:
+            _body_dicts[dict_id] = conn.execute(
+                select(BodyDict.data).where(BodyDict.id == dict_id)
+            ).scalar()
+        return _body_dicts[dict_id]
+
+
+def train_body_dictionary(sample_limit=200):
+    """
+    Train a new zlib dictionary from stored bodies; new bodies use it.
+    
+    Returns:
+        New dictionary id, or None if there was too little shared content
+    """
+    if engine is None:
+        init_db()
+    
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(ArticleBody.payload, ArticleBody.dict_id)
+            .order_by(ArticleBody.created_at.desc())
+            .limit(sample_limit)
+        ).all()
+        samples = [bodies.decompress(payload, _load_body_dict(conn, dict_id)) for payload, dict_id in rows]
+        
+        zdict = bodies.train_dictionary(samples)
+        if not zdict:
+            return None
+        
+        dict_id = conn.execute(
+            BodyDict.__table__.insert().values(data=zdict, sample_count=len(samples), created_at=datetime.utcnow())
+        ).inserted_primary_key[0]
+    
+    print(f"✓ Trained body dictionary #{dict_id} ({len(zdict)} bytes, {len(samples)} samples)")
+    return dict_id
+
+
+def save_article_body(link, body):
+    """
+    Store a full article body, compressed with the latest dictionary.
+    
+    Args:
+        link: Article URL
+        body: Dict with 'content_cn' (HTML) and 'content_ko' (paragraphs)
+    """
+    if engine is None:
+        init_db()
+    
+    raw = bodies.encode_body({'content_cn': body.get('content_cn', ''), 'content_ko': body.get('content_ko', [])})
+    
+    with engine.begin() as conn:
+        dict_id = conn.execute(select(func.max(BodyDict.id))).scalar() or 0
+        payload = bodies.compress(raw, _load_body_dict(conn, dict_id))
         
-        articles = query.all()
-        return articles
+        stmt = sqlite_insert(ArticleBody.__table__).values(
+            link=link, payload=payload, dict_id=dict_id,
+            raw_size=len(raw), stored_size=len(payload), created_at=datetime.utcnow()
+        )
+        conn.execute(stmt.on_conflict_do_update(index_elements=['link'], set_={
+            'payload': stmt.excluded.payload,
+            'dict_id': stmt.excluded.dict_id,
+            'raw_size': stmt.excluded.raw_size,
+            'stored_size': stmt.excluded.stored_size,
+        }))
         
+        needs_dict = (
+            dict_id == 0 and BODY_DICT_MIN_SAMPLES > 0 and
+            conn.execute(select(func.count()).select_from(ArticleBody.__table__)).scalar() >= BODY_DICT_MIN_SAMPLES
+        )
+    
+    if needs_dict:
+        train_body_dictionary()
+
+
+def get_article_body(link):
+    """
+    Load a stored article body.
+    
+    Returns:
+        Dict with 'content_cn' and 'content_ko', or None if not stored
+    """
+    if engine is None:
+        init_db()
+    
+    with engine.connect() as conn:
+        row = conn.execute(
+            select(ArticleBody.payload, ArticleBody.dict_id).where(ArticleBody.link == link)
+        ).first()
+        if row is None:
+            return None
+        return bodies.decode_body(bodies.decompress(row.payload, _load_body_dict(conn, row.dict_id)))
+
+
+def _archive_rows(rows):
+    """Append expired article rows to data/archive/articles-YYYY-MM.jsonl.gz."""
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    
+    by_month = {}
+    for row in rows:
+        record = {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        }
+        by_month.setdefault(row['date'][:7], []).append(record)
+    
+    # gzip members can be concatenated, so appending keeps each file valid
+    for month, records in by_month.items():
+        path = os.path.join(ARCHIVE_DIR, f"articles-{month}.jsonl.gz")
+        with gzip.open(path, 'at', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def reclaim_space(max_pages=None):
+    """
+    Return free pages to the filesystem with PRAGMA incremental_vacuum.
+    
+    Works in steps of CLEANUP_VACUUM_PAGES so the write lock is released in
+    between. Only effective when the database uses auto_vacuum=INCREMENTAL.
+    
+    Returns:
+        Number of pages released
+    """
+    if engine is None:
+        init_db()
+    
+    released = 0
+    raw = engine.raw_connection()
+    try:
+        while max_pages is None or released < max_pages:
+            free_pages = raw.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free_pages:
+                break
+            
+            step = min(free_pages, CLEANUP_VACUUM_PAGES)
+            # sqlite3's execute() steps the pragma only once (one page);
+            # executescript() runs it to completion
+            raw.executescript(f"PRAGMA incremental_vacuum({step});")
+            
+            remaining = raw.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free_pages:
+                # auto_vacuum is off; nothing can be reclaimed incrementally
+                break
+            released += free_pages - remaining
+            time.sleep(CLEANUP_PAUSE)
     finally:
-        session.close()
+        raw.close()
+    
+    return released
 
 
-def cleanup_old_articles(days=7):
+def cleanup_old_articles(days=7, chunk_size=None, archive=None):
     """
     Delete articles older than specified days.
     
+    Rows are deleted in chunks of chunk_size, each in its own short
+    transaction followed by a brief pause, so API requests and crawls are
+    not locked out for the whole run. Stored bodies of deleted articles go
+    with them, and freed pages are handed back with incremental_vacuum.
+    
     Args:
         days: Number of days to retain (default: 7)
+        chunk_size: Rows per transaction (default: CLEANUP_CHUNK_SIZE)
+        archive: Write rows to data/archive before deleting them
+            (default: CLEANUP_ARCHIVE)
     
     Returns:
         Number of articles deleted
     """
-    session = get_session()
+    if engine is None:
+        init_db()
+    
+    chunk_size = chunk_size or CLEANUP_CHUNK_SIZE
+    archive = CLEANUP_ARCHIVE if archive is None else archive
+    cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    articles = Article.__table__
+    deleted = 0
     
     try:
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        while True:
+            with engine.begin() as conn:
+                columns = list(articles.c) if archive else [articles.c.id, articles.c.link]
+                rows = conn.execute(
+                    select(*columns)
+                    .where(articles.c.date < cutoff_date)
+                    .order_by(articles.c.id)
+                    .limit(chunk_size)
+                ).mappings().all()
+                if not rows:
+                    break
+                
+                if archive:
+                    _archive_rows(rows)
+                
+                conn.execute(articles.delete().where(articles.c.id.in_([row['id'] for row in rows])))
+                conn.execute(ArticleBody.__table__.delete().where(
+                    ArticleBody.link.in_([row['link'] for row in rows])
+                ))
+                deleted += len(rows)
+            
+            # Let readers and writers waiting on the lock get in
+            time.sleep(CLEANUP_PAUSE)
+        
+        with engine.begin() as conn:
+            conn.execute(SourceStats.__table__.delete().where(SourceStats.date < cutoff_date))
         
-        deleted = session.query(Article).filter(Article.date < cutoff_date).delete()
-        session.commit()
+        released = reclaim_space()
         
-        print(f"✓ Cleaned up {deleted} articles older than {cutoff_date}")
+        print(f"✓ Cleaned up {deleted} articles older than {cutoff_date} ({released} pages reclaimed)")
         return deleted
         
     except Exception as e:
-        session.rollback()
         print(f"✗ Error cleaning up articles: {e}")
         raise
-    finally:
-        session.close()
 
 
 def get_stats():
-    """Get database statistics."""
+    """
+    Get database statistics.
+    
+    Read from the source_stats table with a single GROUP BY, so the cost
+    does not grow with the number of stored articles.
+    """
     session = get_session()
     
     try:
-        total = session.query(Article).count()
-        
         # Count by source
-        by_source = {}
-        for source_key in ['fujian', 'hainan', 'nanfang', 'guangzhou', 'guangxi']:
-            count = session.query(Article).filter(Article.source_key == source_key).count()
-            by_source[source_key] = count
+        by_source = {source_key: 0 for source_key in ['fujian', 'hainan', 'nanfang', 'guangzhou', 'guangxi']}
+        last_updated = {}
+        rows = session.query(
+            SourceStats.source_key,
+            func.sum(SourceStats.count),
+            func.max(SourceStats.last_updated)
+        ).group_by(SourceStats.source_key).all()
+        for source_key, count, updated in rows:
+            by_source[source_key] = int(count or 0)
+            last_updated[source_key] = updated.isoformat() if updated else None
+        
+        # Count by date and source
+        by_date = {}
+        for stat in session.query(SourceStats).order_by(SourceStats.date.desc(), SourceStats.source_key):
+            by_date.setdefault(stat.date, {})[stat.source_key] = stat.count
         
-        # Database file size
-        db_size = os.path.getsize(DB_PATH) if os.path.exists(DB_PATH) else 0
+        # Database size on disk; under WAL, recent writes are still in -wal
+        db_size = sum(
+            os.path.getsize(path) for path in (DB_PATH, DB_PATH + '-wal') if os.path.exists(path)
+        )
         db_size_mb = db_size / (1024 * 1024)
         
         return {
-            'total_articles': total,
+            'total_articles': sum(by_source.values()),
             'by_source': by_source,
+            'by_date': by_date,
+            'last_updated': last_updated,
             'db_size_mb': round(db_size_mb, 2)
         }
         
@@ -1,6 +1,6 @@
 """Database models for news aggregator."""
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Index, LargeBinary, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -24,11 +24,12 @@ class Article(Base):
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    # Indexes for performance
+    # Indexes for performance. idx_source_date serves /api/news
+    # (source_key = ? AND date = ? ORDER BY date DESC, source_key);
+    # link is already indexed by its UNIQUE constraint.
     __table_args__ = (
+        Index('idx_source_date', 'source_key', 'date'),
         Index('idx_date', 'date'),
-        Index('idx_source', 'source_key'),
-        Index('idx_link', 'link'),
     )
     
     def __repr__(self):
@@ -49,3 +50,66 @@ class Article(Base):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'last_updated': self.last_updated.isoformat() if self.last_updated else None,
         }
+
+
+class SourceStats(Base):
+    """Per-source, per-date article counts, kept in step with articles."""
+    
+    __tablename__ = 'source_stats'
+    
+    source_key = Column(String(20), primary_key=True)
+    date = Column(String(10), primary_key=True)           # YYYY-MM-DD
+    count = Column(Integer, nullable=False, default=0)
+    last_updated = Column(DateTime)                       # Latest article update
+    
+    def __repr__(self):
+        return f"<SourceStats(source_key='{self.source_key}', date='{self.date}', count={self.count})>"
+
+
+class ArticleBody(Base):
+    """Full article body, compressed (see database.bodies)."""
+    
+    __tablename__ = 'article_bodies'
+    
+    link = Column(String(500), primary_key=True)
+    payload = Column(LargeBinary, nullable=False)         # zlib-compressed JSON
+    dict_id = Column(Integer, nullable=False, default=0)  # body_dicts.id, 0 = none
+    raw_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<ArticleBody(link='{self.link}', {self.raw_size} -> {self.stored_size} bytes)>"
+
+
+class BodyDict(Base):
+    """zlib preset dictionary trained on stored article bodies."""
+    
+    __tablename__ = 'body_dicts'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    data = Column(LargeBinary, nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class StarredItem(Base):
+    """Article in the selection basket; unstarring leaves a tombstone row."""
+    
+    __tablename__ = 'starred_items'
+    
+    link = Column(String(500), primary_key=True)
+    item = Column(Text)                                   # Listing item as JSON
+    starred = Column(Boolean, nullable=False, default=True)
+    seq = Column(Integer, nullable=False)                 # Change cursor, increases on every write
+    source_key = Column(String(20))
+    date = Column(String(10))                             # YYYY-MM-DD
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # /api/selection?since= reads changes after a cursor
+    __table_args__ = (
+        Index('idx_starred_seq', 'seq'),
+    )
+    
+    def __repr__(self):
+        return f"<StarredItem(link='{self.link}', starred={self.starred}, seq={self.seq})>"
@@ -0,0 +1,220 @@
+"""
+Full-text search over articles with SQLite FTS5.
+
+SQLite's built-in tokenizers do not segment Chinese, so text is indexed
+as overlapping character bigrams: runs of CJK ideographs become
+"福建 建日 日报", while Latin words, digits and Hangul pass through
+unchanged and are split by unicode61 as usual. A single character has
+no bigram of its own when it ends a run ("西" in "广西"), so every CJK
+character is also indexed once more, as a unigram, in the 'chars' column;
+a one-character query matches there. Unigrams get their own column so
+that phrase matches on the bigram columns never run into them.
+
+The bigram transform runs in Python (cjk_bigrams()), so articles_fts
+rows are written by index_articles(), which save_articles calls for
+every saved chunk, not by triggers: a trigger calling a Python function
+would make every other writer (sqlite3 CLI, scripts, restores) fail with
+"no such function". Deletes need no transform and are mirrored by a
+plain SQL trigger, so they stay in sync whoever makes them. Articles
+inserted or edited outside save_articles are picked up by
+rebuild_search_index().
+
+articles_fts stores the bigram text and is joined back to articles by
+rowid = articles.id. Only titles, translated titles and
+content_preview are indexed; article bodies are not.
+"""
+import re
+
+from sqlalchemy import text, bindparam
+
+# Weights for bm25(): title matches rank above translation and preview;
+# the last weight is for the single-character column
+BM25_WEIGHTS = (10.0, 5.0, 1.0, 1.0)
+
+# Rows per statement when (re)indexing
+INDEX_CHUNK_SIZE = 500
+
+_CJK_RUN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]+')
+_OTHER_RE = re.compile(r'[^㐀-䶿一-鿿豈-﫿]+')
+_TOKEN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]+|[^㐀-䶿一-鿿豈-﫿]+')
+
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE articles_fts USING fts5(
+        title, title_ko, content, chars, tokenize='unicode61'
+    )""",
+    """CREATE TRIGGER articles_fts_ad AFTER DELETE ON articles BEGIN
+        DELETE FROM articles_fts WHERE rowid = old.id;
+    END""",
+]
+
+# Earlier schema: contentless table kept in sync by triggers that called
+# cjk_bigrams() as an SQL function
+LEGACY_TRIGGERS = ('articles_fts_ai', 'articles_fts_au')
+
+_SELECT_BY_LINK = text(
+    "SELECT id, title, title_ko, content_preview FROM articles WHERE link IN :links"
+).bindparams(bindparam('links', expanding=True))
+_DELETE_BY_ID = text(
+    "DELETE FROM articles_fts WHERE rowid IN :ids"
+).bindparams(bindparam('ids', expanding=True))
+_INSERT = text(
+    "INSERT INTO articles_fts (rowid, title, title_ko, content, chars) "
+    "VALUES (:id, :title, :title_ko, :content, :chars)"
+)
+
+
+def _bigram_tokens(text):
+    """Split text into index tokens: CJK bigrams plus other text unchanged."""
+    tokens = []
+    for chunk in _TOKEN_RE.findall(text):
+        if _CJK_RUN_RE.fullmatch(chunk):
+            if len(chunk) == 1:
+                tokens.append(chunk)
+            else:
+                tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+        elif chunk.strip():
+            tokens.append(chunk.strip())
+    return tokens
+
+
+def cjk_bigrams(text):
+    """SQL function: text rewritten as space-separated index tokens."""
+    if not text:
+        return ''
+    return ' '.join(_bigram_tokens(text))
+
+
+def cjk_unigrams(*texts):
+    """Every CJK character of texts, space-separated (the 'chars' column)."""
+    return ' '.join(char for text in texts if text for run in _CJK_RUN_RE.findall(text) for char in run)
+
+
+def build_match_query(query):
+    """
+    Turn a user query into an FTS5 MATCH expression.
+
+    Each whitespace-separated term becomes a phrase of its bigrams, so it
+    matches as a contiguous substring; terms are ANDed. A single CJK
+    character has no bigram of its own and matches the unigram column.
+
+    Returns:
+        MATCH expression, or None if the query has no searchable text
+    """
+    phrases = []
+    for term in query.split():
+        tokens = _bigram_tokens(term)
+        if not tokens:
+            continue
+        phrases.append('"' + ' '.join(tokens).replace('"', '""') + '"')
+    return ' '.join(phrases) or None
+
+
+def _write_index_rows(conn, rows):
+    """(Re)index (id, title, title_ko, content_preview) rows."""
+    if not rows:
+        return
+    conn.execute(_DELETE_BY_ID, {'ids': [row[0] for row in rows]})
+    conn.execute(_INSERT, [
+        {
+            'id': row_id,
+            'title': cjk_bigrams(title),
+            'title_ko': cjk_bigrams(title_ko),
+            'content': cjk_bigrams(preview),
+            'chars': cjk_unigrams(title, preview),
+        }
+        for row_id, title, title_ko, preview in rows
+    ])
+
+
+def index_articles(conn, links):
+    """Index (or re-index) the articles with the given links, in conn's transaction."""
+    links = list(links)
+    for start in range(0, len(links), INDEX_CHUNK_SIZE):
+        chunk = links[start:start + INDEX_CHUNK_SIZE]
+        _write_index_rows(conn, conn.execute(_SELECT_BY_LINK, {'links': chunk}).all())
+
+
+def _backfill(conn):
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, title, title_ko, content_preview FROM articles "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': INDEX_CHUNK_SIZE}).all()
+        if not rows:
+            return
+        _write_index_rows(conn, rows)
+        last_id = rows[-1][0]
+
+
+def drop_search_index(conn):
+    """Drop articles_fts and every trigger that maintains it."""
+    for trigger in ('articles_fts_ad',) + LEGACY_TRIGGERS:
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.exec_driver_sql("DROP TABLE IF EXISTS articles_fts")
+
+
+def ensure_search_index(conn):
+    """
+    Create articles_fts if missing (or in an earlier form: trigger-based,
+    or without the 'chars' column) and index existing rows.
+
+    Returns:
+        True if the index was (re)built
+    """
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).first()
+    legacy = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name IN ('articles_fts_ai', 'articles_fts_au')"
+    ).first()
+    current = exists and 'chars' in {
+        row[1] for row in conn.exec_driver_sql("PRAGMA table_info(articles_fts)")
+    }
+    if current and not legacy:
+        return False
+
+    drop_search_index(conn)
+    for statement in FTS_DDL:
+        conn.exec_driver_sql(statement)
+    _backfill(conn)
+    return True
+
+
+def rebuild_search_index(conn):
+    """Rebuild articles_fts from scratch (after writes made outside save_articles)."""
+    drop_search_index(conn)
+    return ensure_search_index(conn)
+
+
+def search_query_sql(source_key=None, date_from=None, date_to=None):
+    """
+    Build the ranked search SELECT and its COUNT companion.
+
+    Returns:
+        (select_sql, count_sql) using :match, :source_key, :date_from,
+        :date_to, :limit and :offset parameters
+    """
+    filters = ["articles_fts MATCH :match"]
+    if source_key:
+        filters.append("a.source_key = :source_key")
+    if date_from:
+        filters.append("a.date >= :date_from")
+    if date_to:
+        filters.append("a.date <= :date_to")
+    where = " AND ".join(filters)
+
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    select_sql = (
+        "SELECT a.source, a.source_key, a.section, a.title, a.title_ko, a.link, a.date, "
+        "s.link IS NOT NULL AS starred, "
+        f"bm25(articles_fts, {weights}) AS score "
+        "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+        "LEFT JOIN starred_items s ON s.link = a.link AND s.starred = 1 "
+        f"WHERE {where} ORDER BY score, a.date DESC LIMIT :limit OFFSET :offset"
+    )
+    count_sql = (
+        "SELECT COUNT(*) FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+        f"WHERE {where}"
+    )
+    return select_sql, count_sql
@@ -77,13 +77,13 @@ class ContentExtractor:
     
     def _extract_with_beautifulsoup(self, url, timeout):
         """Fallback extraction using BeautifulSoup (basic implementation)."""
-        import requests
+        from utils.http_engine import get_engine
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = get_engine().get(url, headers=headers, timeout=timeout)
         response.encoding = 'utf-8'
         
         soup = BeautifulSoup(response.text, 'html.parser')
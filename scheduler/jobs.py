@@ -1,6 +1,7 @@
 """Crawling job functions for background scheduler."""
 import logging
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from database import save_articles, cleanup_old_articles
 
 logger = logging.getLogger(__name__)
@@ -28,10 +29,10 @@ def crawl_source_job(source_key):
         # Call the real-time crawler
         response = get_news_realtime(source_key, current_date, date_str)
         
-        # Extract data from JSON response
-        response_data = response.get_json()
+        # Extract data from JSON response (get_news_realtime returns a plain dict)
+        response_data = response.get_json() if hasattr(response, 'get_json') else response
         
-        if response_data['status'] != 'success':
+        if response_data.get('status') != 'success':
             logger.error(f"[{source_key}] Crawl returned error status")
             return {
                 'source': source_key,
@@ -107,19 +108,23 @@ def crawl_all_fast_sources():
     logger.info("Starting scheduled crawl for FAST sources")
     logger.info("=" * 60)
     
-    results = []
-    
-    # Crawl each fast source
-    for job_func, name in [
+    jobs = [
         (crawl_fujian_job, 'Fujian Daily'),
         (crawl_hainan_job, 'Hainan Daily'),
         (crawl_nanfang_job, 'Nanfang Daily'),
         (crawl_guangzhou_job, 'Guangzhou Daily'),
-    ]:
-        logger.info(f"\n>>> Crawling {name}...")
-        result = job_func()
-        results.append(result)
-        
+    ]
+    
+    # Crawl all fast sources concurrently; the shared fetch engine caps
+    # total and per-host connections
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix='crawl') as executor:
+        futures = []
+        for job_func, name in jobs:
+            logger.info(f">>> Crawling {name}...")
+            futures.append((name, executor.submit(job_func)))
+        results = [future.result() for _, future in futures]
+    
+    for (name, _), result in zip(futures, results):
         if result['success']:
             logger.info(f"✓ {name}: {result['article_count']} articles")
         else:
@@ -0,0 +1,119 @@
+"""
+Benchmark database.save_articles against the old per-row implementation.
+
+Each size is run on a fresh temporary database, twice per implementation:
+once inserting new articles and once re-saving the same links (the
+update path taken by re-crawls).
+
+Usage:
+    python scripts/bench_save_articles.py [--sizes 1000,10000,100000]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import IntegrityError
+
+from database import db
+from database.models import Article
+
+
+def legacy_save_articles(articles_data, source_key, date_str):
+    """The pre-upsert save_articles: one SELECT plus insert/update per article."""
+    session = db.get_session()
+    success_count = 0
+    error_count = 0
+
+    try:
+        for article_data in articles_data:
+            try:
+                existing = session.query(Article).filter_by(link=article_data['link']).first()
+
+                if existing:
+                    existing.title = article_data.get('title', existing.title)
+                    existing.title_ko = article_data.get('title_ko', existing.title_ko)
+                    existing.section = article_data.get('section', existing.section)
+                    existing.content_preview = article_data.get('content_preview', existing.content_preview)
+                    existing.last_updated = datetime.utcnow()
+                else:
+                    session.add(Article(
+                        source=article_data.get('source', ''),
+                        source_key=source_key,
+                        section=article_data.get('section', ''),
+                        title=article_data['title'],
+                        title_ko=article_data.get('title_ko', ''),
+                        link=article_data['link'],
+                        content_preview=article_data.get('content_preview', ''),
+                        date=date_str
+                    ))
+
+                success_count += 1
+
+            except IntegrityError:
+                session.rollback()
+                error_count += 1
+
+        session.commit()
+    finally:
+        session.close()
+
+    return success_count, error_count
+
+
+def make_articles(n):
+    return [
+        {
+            'source': '福建日报',
+            'section': f'{i % 12 + 1:02d} 要闻',
+            'title': f'基准测试新闻标题 {i}',
+            'title_ko': f'벤치마크 뉴스 제목 {i}',
+            'link': f'https://bench.example.com/{i}.html',
+            'content_preview': '这是一篇用于基准测试的新闻预览内容。' * 5,
+        }
+        for i in range(n)
+    ]
+
+
+def run_once(save_fn, articles):
+    tmp_dir = tempfile.mkdtemp(prefix='bench_db_')
+    try:
+        db.init_db(os.path.join(tmp_dir, 'bench.db'))
+
+        start = time.perf_counter()
+        save_fn(articles, 'fujian', '2025-01-01')
+        insert_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        save_fn(articles, 'fujian', '2025-01-01')
+        update_time = time.perf_counter() - start
+
+        db.Session.remove()
+        db.engine.dispose()
+        return insert_time, update_time
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='Comma-separated article counts')
+    args = parser.parse_args()
+
+    print(f"{'articles':>10} {'impl':>8} {'insert s':>10} {'update s':>10} {'rows/s':>10}")
+    for n in (int(size) for size in args.sizes.split(',')):
+        articles = make_articles(n)
+        for name, save_fn in (('legacy', legacy_save_articles), ('upsert', db.save_articles)):
+            insert_time, update_time = run_once(save_fn, articles)
+            rate = 2 * n / (insert_time + update_time)
+            print(f"{n:>10} {name:>8} {insert_time:>10.2f} {update_time:>10.2f} {rate:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Convert data/news.db to the configured auto_vacuum mode (DB_AUTO_VACUUM).
+
+New databases get the mode when they are created; an existing one needs
+a full VACUUM, which rewrites the file and holds the write lock for the
+whole run. Stop the app and the scheduler before running this.
+
+Usage:
+    python scripts/convert_auto_vacuum.py [--db data/news.db]
+"""
+import os
+import sys
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', help='Database file (default: data/news.db)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    db.init_db(args.db)
+    if not db.convert_auto_vacuum():
+        print(f"✓ Database already uses auto_vacuum={db.DB_AUTO_VACUUM}")
+
+
+if __name__ == '__main__':
+    main()
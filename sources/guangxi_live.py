@@ -0,0 +1,536 @@
+"""
+Guangxi Daily (广西日报) edition probing.
+
+The Guangxi e-paper is a JavaScript app without a usable listing page, so
+articles are discovered by probing ?code=XXX&xuhao=N URLs. Sections are
+probed concurrently; within a section, article slots are probed in small
+speculative windows but evaluated strictly in order, so the
+"3 consecutive failures ends the section" rule behaves exactly as the
+sequential crawler did.
+
+Rendering waits for the article to appear instead of sleeping a fixed
+five seconds: it returns as soon as an author / 本报讯 / date-edition
+marker is in the DOM, and gives up early when the page's data requests
+have finished without producing one.
+
+Edition discovery avoids blind probing altogether: one page per section
+is rendered while its XHR/JSON responses are captured, the article list
+is read from that data, and individual articles are fetched with plain
+HTTP from the e-paper's data endpoint. Probing is only used for sections
+whose data could not be captured.
+"""
+import os
+import re
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+GUANGXI_BASE_URL = "https://gxrb.gxrb.com.cn/"
+
+# Sections 001-009, articles 1-10 per section
+SECTION_CODES = [f"{n:03d}" for n in range(1, 10)]
+MAX_ARTICLES_PER_SECTION = 10
+MAX_CONSECUTIVE_FAILURES = 3
+
+# Data endpoint the e-paper's mobile view is served from; it accepts the
+# same name/date/code/xuhao query as the desktop URL
+GUANGXI_DATA_ENDPOINT = os.environ.get(
+    'GUANGXI_DATA_ENDPOINT', 'https://ssw.gxrb.com.cn/json/interface/epaper/api.php'
+)
+
+# 'xhr' discovers articles from captured data; 'probe' renders every slot
+DISCOVERY_MODE = os.environ.get('GUANGXI_DISCOVERY', 'xhr')
+
+# Keys the JSON data may use for article fields
+TITLE_KEYS = ('title', 'Title', 'biaoti', 'bt')
+CONTENT_KEYS = ('content', 'Content', 'neirong', 'text', 'body')
+XUHAO_KEYS = ('xuhao', 'xh', 'sort', 'order')
+LINK_KEYS = ('url', 'link', 'href', 'linkurl', 'shareUrl')
+
+# Sequence number in an article link (...&code=001&xuhao=3)
+XUHAO_PARAM_RE = re.compile(r'[?&]xuhao=(\d+)')
+
+# Maximum number of in-flight probes against one host
+MAX_CONCURRENCY_PER_HOST = int(os.environ.get('GUANGXI_MAX_CONCURRENCY', '4'))
+
+# Ceiling for waiting on a rendered article (milliseconds)
+RENDER_TIMEOUT_MS = int(os.environ.get('GUANGXI_RENDER_TIMEOUT_MS', '5000'))
+
+# After the last data (XHR/fetch) response, wait this long for article text
+# before treating the slot as empty (milliseconds)
+EMPTY_GRACE_MS = 1000
+
+POLL_INTERVAL_MS = 100
+
+# Text that only appears once an article body has rendered; these match the
+# markers fetch_guangxi_article_with_playwright uses to locate the title.
+ARTICLE_MARKERS = ['本报讯', '广西日报记者', '通讯员', '■']
+
+# Text shown by the e-paper when a code/xuhao slot has no article
+EMPTY_MARKERS = ['暂无', '不存在', '没有找到']
+
+_READINESS_JS = """
+(args) => {
+    const text = document.body ? document.body.innerText : '';
+    if (args.article.some(m => text.includes(m))) return 'article';
+    // Date/edition line such as "2025年11月20日第 001 版）"
+    if (text.split('\\n').some(l => l.includes('年') && l.includes('月') && l.includes('日') && l.includes('版）'))) return 'article';
+    if (args.empty.some(m => text.includes(m))) return 'empty';
+    return '';
+}
+"""
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def build_article_url(date_str: str, code: str, xuhao: int) -> str:
+    """
+    生成广西日报文章 URL，例如：
+    https://gxrb.gxrb.com.cn/?name=gxrb&date=2025-11-20&code=001&xuhao=1
+    """
+    return f"{GUANGXI_BASE_URL}?name=gxrb&date={date_str}&code={code}&xuhao={xuhao}"
+
+
+def _host_semaphore(url: str, limit: int) -> threading.BoundedSemaphore:
+    """Get the shared semaphore limiting concurrent probes for url's host."""
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        sem = _host_semaphores.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(limit)
+            _host_semaphores[host] = sem
+        return sem
+
+
+def wait_for_article(page, last_data_response, timeout_ms=RENDER_TIMEOUT_MS):
+    """
+    Wait until the current page shows an article, shows nothing, or times out.
+
+    Args:
+        page: Playwright Page already navigated to an article URL
+        last_data_response: List that a response listener appends monotonic
+            timestamps of finished XHR/fetch responses to
+        timeout_ms: Ceiling for the whole wait
+
+    Returns:
+        'article', 'empty' or 'timeout'
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+
+    while True:
+        state = page.evaluate(_READINESS_JS, {'article': ARTICLE_MARKERS, 'empty': EMPTY_MARKERS})
+        if state:
+            return state
+
+        now = time.monotonic()
+        # Fast negative path: data arrived but no article text rendered
+        if last_data_response and now - last_data_response[-1] >= EMPTY_GRACE_MS / 1000:
+            return 'empty'
+        if now >= deadline:
+            return 'timeout'
+
+        page.wait_for_timeout(POLL_INTERVAL_MS)
+
+
+def parse_guangxi_article_text(all_text):
+    """
+    Extract title and content paragraphs from a rendered article's text.
+
+    Returns:
+        Dict with 'title' (None when no article was found) and 'content'
+    """
+    # Split into lines and filter
+    lines = [line.strip() for line in all_text.split('\n') if line.strip()]
+
+    # Find title - try multiple strategies
+    title = None
+    content_lines = []
+
+    # Strategy 1: Look for title with author marker (most reliable)
+    for i, line in enumerate(lines):
+        # Skip navigation and metadata
+        if any(skip in line for skip in ['数字报首页', '按日期查找', '版面导航', '字体：', '返回', '新闻中心', 'ICP证', '广西新闻网版权']):
+            continue
+
+        # Look for title - substantial line before author marker
+        if not title and 15 < len(line) < 200:
+            # Check if next few lines contain author marker
+            next_lines = lines[i+1:i+5]
+            if any('■' in l or '广西云-广西日报记者' in l or '广西日报记者' in l or '通讯员' in l for l in next_lines):
+                title = line
+                break
+
+    # Strategy 2: If no title found, look for substantial lines after date marker
+    if not title:
+        found_date_marker = False
+        for i, line in enumerate(lines):
+            # Look for date/edition marker like "2025年11月20日第 001 版）"
+            if '年' in line and '月' in line and '日' in line and '版）' in line:
+                found_date_marker = True
+                continue
+
+            # After date marker, find first substantial line
+            if found_date_marker and 10 < len(line) < 200:
+                # Skip common non-title patterns
+                if any(skip in line for skip in ['数字报首页', '按日期查找', '版面导航', '字体', '返回', '发布时间', '各版主要新闻']):
+                    continue
+                title = line
+                break
+
+    # Collect content
+    for i, line in enumerate(lines):
+        if len(line) > 30:
+            if '本报讯' in line or '（广西云-广西日报记者' in line:
+                content_lines.append(line)
+            elif not any(skip in line for skip in ['发布时间', '版中缝', '各版主要新闻', '数字报首页', '按日期查找']):
+                # Only add if it looks like content
+                if any(char in line for char in ['，', '。', '、', '：']):
+                    content_lines.append(line)
+
+    return {
+        'title': title,
+        'content': content_lines[:10]  # Limit to first 10 paragraphs
+    }
+
+
+def _first_value(entry, keys):
+    for key in keys:
+        value = entry.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _html_to_paragraphs(value):
+    """Turn an HTML or plain-text content field into paragraph strings."""
+    text = BeautifulSoup(str(value), 'html.parser').get_text('\n')
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+
+def _find_article_list(payload):
+    """Depth-first search for the first list of dicts carrying article titles."""
+    if isinstance(payload, list):
+        # Short names belong to section/calendar lists, not articles
+        if payload and all(isinstance(e, dict) for e in payload) and \
+                any(len(str(_first_value(e, TITLE_KEYS) or '')) >= 5 for e in payload):
+            return payload
+        children = payload
+    elif isinstance(payload, dict):
+        children = payload.values()
+    else:
+        return None
+
+    for child in children:
+        found = _find_article_list(child)
+        if found is not None:
+            return found
+    return None
+
+
+def _entry_xuhao(entry):
+    """An entry's sequence number from its xuhao field or its own link, or None."""
+    try:
+        value = _first_value(entry, XUHAO_KEYS)
+        if value is not None:
+            return int(value)
+    except (TypeError, ValueError):
+        pass
+
+    link = _first_value(entry, LINK_KEYS)
+    match = XUHAO_PARAM_RE.search(str(link)) if link else None
+    return int(match.group(1)) if match else None
+
+
+def article_entries_from_payloads(payloads):
+    """
+    Read a section's article list out of captured JSON payloads.
+
+    Entries whose sequence number cannot be read from the entry itself
+    (xuhao field or link) are skipped.
+
+    Returns:
+        List of {title, xuhao, content} in page order, or None when no
+        payload contains an article list with usable entries (the caller
+        then probes the section)
+    """
+    for payload in payloads:
+        article_list = _find_article_list(payload)
+        if article_list is None:
+            continue
+
+        article_list = [e for e in article_list if _first_value(e, TITLE_KEYS)]
+
+        entries = []
+        seen = set()
+        for entry in article_list:
+            # Page order need not match the site's numbering, so an entry
+            # without its own xuhao is skipped rather than guessed
+            xuhao = _entry_xuhao(entry)
+            if xuhao is None or xuhao in seen:
+                logger.debug(f"Skipping Guangxi entry without a usable xuhao: {_first_value(entry, TITLE_KEYS)}")
+                continue
+            seen.add(xuhao)
+            content = _first_value(entry, CONTENT_KEYS)
+            entries.append({
+                'title': BeautifulSoup(str(_first_value(entry, TITLE_KEYS)), 'html.parser').get_text(strip=True),
+                'xuhao': xuhao,
+                'content': _html_to_paragraphs(content)[:10] if content else [],
+            })
+        if entries:
+            return entries
+
+    return None
+
+
+def parse_guangxi_data_response(body):
+    """
+    Parse a data endpoint response for one article (JSON or HTML).
+
+    Returns:
+        Dict with 'title' and 'content', or None when nothing usable was found
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+
+    if payload is not None:
+        # A single article object, possibly wrapped in {"data": {...}}
+        candidates = [payload]
+        if isinstance(payload, dict):
+            candidates += [v for v in payload.values() if isinstance(v, dict)]
+        for candidate in candidates:
+            if isinstance(candidate, dict) and _first_value(candidate, TITLE_KEYS):
+                content = _first_value(candidate, CONTENT_KEYS)
+                return {
+                    'title': BeautifulSoup(str(_first_value(candidate, TITLE_KEYS)), 'html.parser').get_text(strip=True),
+                    'content': _html_to_paragraphs(content)[:10] if content else [],
+                }
+        return None
+
+    article = parse_guangxi_article_text(BeautifulSoup(body, 'html.parser').get_text('\n'))
+    return article if article.get('title') else None
+
+
+def build_data_url(article_url: str) -> str:
+    """Map a desktop article URL onto the data endpoint with the same query."""
+    query = urlparse(article_url).query
+    return f"{GUANGXI_DATA_ENDPOINT}?{query}"
+
+
+def capture_section_data(page, url):
+    """
+    Render one section page and return the JSON payloads it loaded.
+
+    Returns:
+        List of decoded JSON payloads from XHR/fetch responses
+    """
+    responses = []
+    last_data_response = []
+
+    def on_response(response):
+        if response.request.resource_type in ('xhr', 'fetch'):
+            responses.append(response)
+            if response.ok:
+                last_data_response.append(time.monotonic())
+
+    page.on('response', on_response)
+    try:
+        page.goto(url, timeout=35000, wait_until='domcontentloaded')
+        wait_for_article(page, last_data_response)
+
+        payloads = []
+        for response in responses:
+            try:
+                payloads.append(response.json())
+            except Exception:
+                # Not JSON (scripts, HTML fragments, failed requests)
+                continue
+        return payloads
+    finally:
+        page.remove_listener('response', on_response)
+
+
+def render_guangxi_page(page, url):
+    """Load a Guangxi Daily page in a pooled browser and return its body text."""
+    last_data_response = []
+
+    def on_response(response):
+        if response.request.resource_type in ('xhr', 'fetch') and response.ok:
+            last_data_response.append(time.monotonic())
+
+    # Listen before navigating so early data responses are not missed
+    page.on('response', on_response)
+    try:
+        # Use domcontentloaded instead of networkidle for better compatibility
+        page.goto(url, timeout=35000, wait_until='domcontentloaded')
+
+        state = wait_for_article(page, last_data_response)
+        logger.debug(f"Guangxi page {state}: {url}")
+
+        # Get all text content from the page
+        return page.inner_text('body')
+    finally:
+        page.remove_listener('response', on_response)
+
+
+class GuangxiProber:
+    """Fan out Guangxi section/article probes with bounded per-host parallelism."""
+
+    def __init__(self, fetch_article, discover_section=None,
+                 max_concurrency=MAX_CONCURRENCY_PER_HOST, log=None):
+        """
+        Args:
+            fetch_article: Callable(url) -> dict with 'title' (and 'content'), or None
+            discover_section: Optional callable(date_str, code) -> list of
+                {title, xuhao, content} entries, or None when the section's
+                data could not be captured
+            max_concurrency: Maximum concurrent probes per host
+            log: Optional callable(message) for progress messages
+        """
+        self.fetch_article = fetch_article
+        self.discover_section = discover_section
+        self.max_concurrency = max(1, max_concurrency)
+        self.log = log or logger.info
+
+    def _probe(self, url):
+        """Fetch one article slot. Returns (article_data, error)."""
+        with _host_semaphore(url, self.max_concurrency):
+            try:
+                return self.fetch_article(url), None
+            except Exception as e:
+                return None, e
+
+    def probe_section(self, executor, date_str, code):
+        """
+        Probe one section and return its articles in xuhao order.
+
+        Returns:
+            List of dicts: {title, url, code, xuhao, data}
+        """
+        articles = []
+        consecutive_failures = 0
+        window = MAX_CONSECUTIVE_FAILURES
+
+        self.log(f"Fetching section {code}...")
+
+        xuhao = 1
+        while xuhao <= MAX_ARTICLES_PER_SECTION:
+            batch = range(xuhao, min(xuhao + window, MAX_ARTICLES_PER_SECTION + 1))
+            futures = []
+            for n in batch:
+                url = build_article_url(date_str, code, n)
+                futures.append((n, url, executor.submit(self._probe, url)))
+
+            # Evaluate strictly in order; results past a stop point are discarded
+            for n, url, future in futures:
+                article_data, error = future.result()
+
+                if error is not None:
+                    self.log(f"Error in article: {str(error)[:50]}")
+                    consecutive_failures += 1
+                    if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                        self.log(f"Too many errors in section {code}")
+                        return articles
+                    continue
+
+                if not article_data or not article_data.get('title'):
+                    # No article found at this position
+                    consecutive_failures += 1
+                    if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                        self.log(f"No more articles in section {code}")
+                        return articles
+                    continue
+
+                consecutive_failures = 0
+
+                title = article_data['title']
+                # Skip if title is too short or looks like navigation
+                if len(title) < 5:
+                    continue
+
+                articles.append({
+                    'title': title,
+                    'url': url,
+                    'code': code,
+                    'xuhao': n,
+                    'data': article_data,
+                })
+
+            xuhao += window
+
+        return articles
+
+    def discover_or_probe_section(self, executor, date_str, code):
+        """Read a section from captured data, probing it only as a fallback."""
+        if self.discover_section is not None:
+            url = build_article_url(date_str, code, 1)
+            with _host_semaphore(url, self.max_concurrency):
+                try:
+                    entries = self.discover_section(date_str, code)
+                except Exception as e:
+                    self.log(f"Discovery error in section {code}: {str(e)[:50]}")
+                    entries = None
+
+            if entries is not None:
+                return [
+                    {
+                        'title': entry['title'],
+                        'url': build_article_url(date_str, code, entry['xuhao']),
+                        'code': code,
+                        'xuhao': entry['xuhao'],
+                        'data': entry,
+                    }
+                    # Skip if title is too short or looks like navigation
+                    for entry in entries if len(entry['title']) >= 5
+                ]
+
+            self.log(f"No data captured for section {code}, probing")
+
+        return self.probe_section(executor, date_str, code)
+
+    def probe_edition(self, date_str, section_codes=SECTION_CODES):
+        """
+        Probe all sections of one edition concurrently.
+
+        Returns:
+            List of article dicts ordered by section, then xuhao
+        """
+        # Each section orchestrates on its own thread; probes run on a shared pool
+        # sized so that every section can keep a full window in flight.
+        probe_workers = len(section_codes) * MAX_CONSECUTIVE_FAILURES
+        with ThreadPoolExecutor(max_workers=probe_workers, thread_name_prefix='gx-probe') as probes, \
+                ThreadPoolExecutor(max_workers=len(section_codes), thread_name_prefix='gx-section') as sections:
+            section_futures = [
+                (code, sections.submit(self.discover_or_probe_section, probes, date_str, code))
+                for code in section_codes
+            ]
+
+            results = []
+            for code, future in section_futures:
+                section_articles = future.result()
+                if section_articles:
+                    self.log(f"Section {code}: {len(section_articles)} articles")
+                results.extend(section_articles)
+
+        return results
+
+
+def probe_guangxi_edition(date_str, fetch_article, discover_section=None,
+                          max_concurrency=MAX_CONCURRENCY_PER_HOST, log=None):
+    """
+    对外暴露的统一接口：给定日期 -> 返回该期所有版面的文章列表
+    """
+    if DISCOVERY_MODE != 'xhr':
+        discover_section = None
+    prober = GuangxiProber(fetch_article, discover_section=discover_section,
+                           max_concurrency=max_concurrency, log=log)
+    return prober.probe_edition(date_str)
@@ -0,0 +1,91 @@
+"""
+Guangzhou Daily (广州日报) live parser.
+
+Section pages are fetched concurrently on the shared fetch engine. Each
+section is parsed as soon as its HTML arrives, so fetching and parsing
+overlap, and results are returned in the original section order.
+"""
+import asyncio
+import logging
+from datetime import date
+
+from bs4 import BeautifulSoup
+
+from utils.fetcher import fetch_html_async
+from utils.http_engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _gzdaily_abs_url(d: date, href: str) -> str:
+    if href.startswith('http'):
+        return href
+    # For PC version, construct the full path
+    date_path = d.strftime("%Y-%m/%d")
+    return f"https://gzdaily.dayoo.com/pc/html/{date_path}/{href}"
+
+
+def parse_gzdaily_index(html: str, d: date) -> dict:
+    """
+    解析 PC 版首页，返回 {版面 URL: 版面名称}（保持页面顺序）
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # PC version structure: find section links
+    # Look for links to section pages (node_XXX.htm)
+    section_map = {}
+    for section_link in soup.select('a[href*="node_"]'):
+        section_href = section_link.get('href')
+        section_text = section_link.get_text(strip=True)
+        if section_href and 'node_' in section_href:
+            abs_url = _gzdaily_abs_url(d, section_href)
+            section_map[abs_url] = section_text if section_text else "未知版面"
+
+    return section_map
+
+
+def parse_gzdaily_section(html: str, d: date) -> list:
+    """
+    解析版面页，返回 [ {title, url}, ... ]
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+
+    # Find article links - PC version uses area tags with data-title
+    for area in soup.select('area[data-title]'):
+        title = area.get('data-title', '').strip()
+        href = area.get('href')
+
+        if href and title and len(title) > 3:
+            results.append({'title': title, 'url': _gzdaily_abs_url(d, href)})
+
+    return results
+
+
+async def _fetch_and_parse_section(d: date, section_url: str) -> list:
+    html = await fetch_html_async(section_url)
+    # Parse off the event loop so other sections keep downloading meanwhile
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, parse_gzdaily_section, html, d)
+
+
+def fetch_gzdaily_sections(d: date, section_map: dict) -> list:
+    """
+    对外暴露的统一接口：并行抓取并解析所有版面
+
+    Args:
+        d: Date for the newspaper
+        section_map: {section URL: section name}, as from parse_gzdaily_index
+
+    Returns:
+        List of (section_name, articles) in section_map order; articles is
+        the exception raised if that section failed
+    """
+    async def pipeline():
+        return await asyncio.gather(
+            *(_fetch_and_parse_section(d, url) for url in section_map),
+            return_exceptions=True
+        )
+
+    results = get_engine().run(pipeline())
+    return list(zip(section_map.values(), results))
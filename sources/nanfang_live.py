@@ -1,10 +1,13 @@
 from datetime import date
 from urllib.parse import urljoin
+import re
+import asyncio
 import logging
 
-import requests
 from bs4 import BeautifulSoup
 
+from utils.http_engine import get_engine
+
 logger = logging.getLogger(__name__)
 
 HEADERS = {
@@ -16,6 +19,14 @@ HEADERS = {
     "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
 }
 
+# Per-request timeout (seconds) for node pages
+REQUEST_TIMEOUT = 15
+
+# Used when the first node page has no section navigation
+DEFAULT_SECTIONS = [f"A{n:02d}" for n in range(1, 9)]
+
+SECTION_HREF_RE = re.compile(r"node_([A-Z]{1,2}\d{2,3})\.html")
+
 
 def build_node_url(d: date, section: str = "A01") -> str:
     """
@@ -25,12 +36,16 @@ def build_node_url(d: date, section: str = "A01") -> str:
     return f"https://epaper.southcn.com/nfdaily/html/{d:%Y%m}/{d:%d}/node_{section}.html"
 
 
+def _decode(resp) -> str:
+    resp.encoding = resp.apparent_encoding or "utf-8"
+    return resp.text
+
+
 def fetch_html(url: str) -> str:
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=15)
+        resp = get_engine().get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
-        resp.encoding = resp.apparent_encoding or "utf-8"
-        return resp.text
+        return _decode(resp)
     except Exception as e:
         logger.error(f"Error fetching {url}: {e}")
         # Return empty string - parse_nanfang_node will return empty list
@@ -89,6 +104,69 @@ def parse_nanfang_node(html: str, base_url: str, section: str = "A01"):
     return results
 
 
+def discover_nanfang_sections(html: str) -> list:
+    """
+    从版面导航中读取当天实际的版面列表，例如 ['A01', 'A02', ..., 'A16']
+    """
+    soup = BeautifulSoup(html, "lxml")
+    sections = []
+
+    for a in soup.find_all("a", href=True):
+        m = SECTION_HREF_RE.search(a["href"])
+        if m and m.group(1) not in sections:
+            sections.append(m.group(1))
+
+    return sections
+
+
+async def _fetch_section_async(d: date, section: str) -> list:
+    url = build_node_url(d, section=section)
+    resp = await get_engine().fetch(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    resp.raise_for_status()
+
+    # Decoding and parsing are CPU-bound; keep them off the event loop
+    loop = asyncio.get_running_loop()
+    html = await loop.run_in_executor(None, _decode, resp)
+    return await loop.run_in_executor(None, parse_nanfang_node, html, url, section)
+
+
+def fetch_nanfang_edition(d: date):
+    """
+    对外暴露的整期接口：先从 A01 版面页读取版面导航，再并行抓取所有版面
+
+    Returns:
+        List of (section, articles) in edition order; articles is the
+        exception raised if that section failed
+    """
+    first_url = build_node_url(d, section="A01")
+    logger.info(f"Discovering Nanfang Daily sections: {first_url}")
+
+    first_html = fetch_html(first_url)
+    sections = discover_nanfang_sections(first_html) if first_html else []
+    if not sections:
+        logger.warning("No section navigation found, falling back to A01-A08")
+        sections = list(DEFAULT_SECTIONS)
+    elif "A01" not in sections:
+        sections.insert(0, "A01")
+
+    # A01 is already downloaded; fetch every other section concurrently
+    async def fetch_rest():
+        return await asyncio.gather(
+            *(_fetch_section_async(d, section) for section in sections if section != "A01"),
+            return_exceptions=True
+        )
+
+    rest = iter(get_engine().run(fetch_rest()))
+    results = []
+    for section in sections:
+        if section == "A01":
+            results.append((section, parse_nanfang_node(first_html, base_url=first_url, section=section)))
+        else:
+            results.append((section, next(rest)))
+
+    return results
+
+
 def fetch_nanfang_articles(d: date, section: str = "A01"):
     """
     对外暴露的统一接口：给定日期 -> 返回该版面文章列表
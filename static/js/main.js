@@ -84,40 +84,74 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    // ============ 状态轮询 ============
+    // ============ 状态推送 ============
+    // 优先使用 Server-Sent Events（/api/crawl/stream），不支持或连接失败时退回轮询
+    let crawlStatusStream = null;
+
+    function handleCrawlStatus(status) {
+        // 更新进度条
+        progressFill.style.width = Math.min(status.progress, 100) + '%';
+        progressText.textContent = `进度: ${status.progress}% | 已发现 ${status.total_articles} 篇`;
+        
+        // 检查是否完成
+        if (status.state === 'completed') {
+            appendLog('✓ 爬取完成！');
+            stopStatusPoller();
+            
+            // 延迟1秒后重新加载页面
+            setTimeout(() => {
+                loadPage();
+            }, 1000);
+        } else if (status.state === 'failed') {
+            appendLog('✗ 爬取失败');
+            stopStatusPoller();
+        }
+    }
+
     function startStatusPoller(sourceKey) {
         stopStatusPoller();
         
+        if (!window.EventSource) {
+            startPollingFallback(sourceKey);
+            return;
+        }
+        
+        let opened = false;
+        crawlStatusStream = new EventSource(`/api/crawl/stream/${sourceKey}`);
+        crawlStatusStream.onopen = () => { opened = true; };
+        crawlStatusStream.addEventListener('log', (e) => {
+            appendLog(JSON.parse(e.data).line);
+        });
+        crawlStatusStream.addEventListener('status', (e) => {
+            handleCrawlStatus(JSON.parse(e.data));
+        });
+        crawlStatusStream.onerror = () => {
+            // 从未连上（例如代理不支持 SSE）时退回轮询；否则浏览器会自动重连
+            if (!opened) {
+                console.warn('状态推送不可用，改为轮询');
+                startPollingFallback(sourceKey);
+            }
+        };
+    }
+
+    function startPollingFallback(sourceKey) {
+        stopStatusPoller();
+        const shownLogs = new Set();
+        
         crawlStatusPoller = setInterval(async () => {
             try {
                 const response = await fetch(`/api/crawl/status/${sourceKey}`);
                 const status = await response.json();
                 
-                if (status.logs && status.logs.length > 0) {
-                    // 获取新日志
-                    const currentLogs = logStream.innerText.split('\n').filter(l => l.trim());
-                    const newLogs = status.logs.filter(l => !currentLogs.includes(l));
-                    
-                    newLogs.forEach(log => appendLog(log));
-                }
-                
-                // 更新进度条
-                progressFill.style.width = Math.min(status.progress, 100) + '%';
-                progressText.textContent = `进度: ${status.progress}% | 已发现 ${status.total_articles} 篇`;
+                // 只追加新日志
+                (status.logs || []).forEach(log => {
+                    if (!shownLogs.has(log)) {
+                        shownLogs.add(log);
+                        appendLog(log);
+                    }
+                });
                 
-                // 检查是否完成
-                if (status.state === 'completed') {
-                    appendLog('✓ 爬取完成！');
-                    stopStatusPoller();
-                    
-                    // 延迟1秒后重新加载页面
-                    setTimeout(() => {
-                        loadPage();
-                    }, 1000);
-                } else if (status.state === 'failed') {
-                    appendLog('✗ 爬取失败');
-                    stopStatusPoller();
-                }
+                handleCrawlStatus(status);
                 
             } catch (err) {
                 console.error('轮询状态失败:', err);
@@ -126,6 +160,10 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     function stopStatusPoller() {
+        if (crawlStatusStream) {
+            crawlStatusStream.close();
+            crawlStatusStream = null;
+        }
         if (crawlStatusPoller) {
             clearInterval(crawlStatusPoller);
             crawlStatusPoller = null;
@@ -180,45 +218,29 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function loadAllSources(dateStr) {
         try {
-            const sources = ['fujian', 'hainan', 'nanfang', 'guangzhou', 'guangxi'];
-            const results = [];
-            let anyLoading = false;
-            let anyEmpty = false;
-            let anyLoaded = false;
-            
-            const responses = await Promise.all(
-                sources.map(source =>
-                    fetch(`/api/news/${source}?date=${dateStr}`).then(r => r.json())
-                )
-            );
-            
-            // 分析响应状态
-            responses.forEach(data => {
-                if (data.status === 'loaded') {
-                    anyLoaded = true;
-                    results.push(...(data.data || []));
-                } else if (data.status === 'loading') {
-                    anyLoading = true;
-                } else if (data.status === 'empty') {
-                    anyEmpty = true;
-                }
-            });
+            // 一次请求获取所有来源（/api/news 批量接口）
+            const response = await fetch(`/api/news?date=${dateStr}`);
+            const data = await response.json();
             
             // 显示优先级: 已加载 > 正在加载 > 无数据
-            if (anyLoaded) {
-                allNews = results;
+            if (data.status === 'loaded') {
+                allNews = data.data.map(item => ({
+                    ...item,
+                    sourceKey: item.source_key
+                }));
                 renderNews();
                 showLoadedState();
                 stopStatusPoller();
                 
-            } else if (anyLoading) {
+            } else if (data.status === 'loading') {
                 // 至少有一个来源在加载，显示加载状态
                 showLoadingState();
                 appendLog('多个来源正在并行爬取...');
-                // 为第一个加载的来源启动轮询
-                const loadingSource = responses.find(r => r.status === 'loading');
-                if (loadingSource) {
-                    startStatusPoller(loadingSource.crawl_status.source_key);
+                // 为第一个加载的来源启动状态推送
+                const loadingKey = Object.keys(data.sources || {})
+                    .find(key => data.sources[key].status === 'loading');
+                if (loadingKey) {
+                    startStatusPoller(loadingKey);
                 }
                 
             } else {
@@ -443,24 +465,73 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    // 筛选筐本地缓存：{ cursor, items }，之后只向服务器请求 cursor 之后的变化
+    const SELECTION_CACHE_KEY = 'selectionCache';
+
+    function loadSelectionCache() {
+        try {
+            const cached = JSON.parse(localStorage.getItem(SELECTION_CACHE_KEY));
+            if (cached && Array.isArray(cached.items)) return cached;
+        } catch (err) {
+            console.warn('Invalid selection cache:', err);
+        }
+        return { cursor: 0, items: [] };
+    }
+
+    function saveSelectionCache(cursor, items) {
+        try {
+            localStorage.setItem(SELECTION_CACHE_KEY, JSON.stringify({ cursor, items }));
+        } catch (err) {
+            console.warn('Failed to save selection cache:', err);
+        }
+    }
+
     async function fetchSelectedNews() {
-        showLoadingState();
-        appendLog('正在获取筛选筐内容...');
+        const cached = loadSelectionCache();
+        if (cached.items.length > 0) {
+            // 先显示本地缓存，再增量同步
+            allNews = cached.items;
+            renderNews();
+            showLoadedState();
+        } else {
+            showLoadingState();
+            appendLog('正在获取筛选筐内容...');
+        }
         
         try {
-            const res = await fetch('/api/selection');
+            const res = await fetch(`/api/selection?since=${cached.cursor}`);
             const data = await res.json();
-            if (data.status === 'success') {
-                allNews = data.data;
+            if (data.status !== 'success') {
+                if (cached.items.length === 0) showEmptyState();
+                return;
+            }
+
+            let items;
+            if (data.full) {
+                items = data.data;
+            } else {
+                // 应用变化：删除取消收藏的，新增/更新的移到末尾
+                const changed = new Set(data.removed.concat(data.data.map(item => item.link)));
+                items = cached.items.filter(item => !changed.has(item.link)).concat(data.data);
+            }
+            saveSelectionCache(data.cursor, items);
+
+            if (data.full || data.data.length > 0 || data.removed.length > 0 || cached.items.length === 0) {
+                allNews = items;
                 renderNews();
                 showLoadedState();
-            } else {
-                showEmptyState();
             }
         } catch (err) {
             console.error(err);
-            showEmptyState();
+            if (cached.items.length === 0) showEmptyState();
         }
     }
 
+    if (window.IS_SELECTION_PAGE) {
+        // 切回页面时同步其他标签页/设备的改动
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'visible') fetchSelectedNews();
+        });
+    }
+
 });
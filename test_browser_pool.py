@@ -0,0 +1,119 @@
+"""Test browser pool failure handling and timeouts with a fake Playwright."""
+import sys
+import time
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from unittest import mock
+
+from utils.browser_pool import BrowserPool
+
+
+class _FakePage:
+    def __init__(self):
+        self.default_timeout = None
+
+    def set_default_timeout(self, ms):
+        self.default_timeout = ms
+
+    def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def is_connected(self):
+        return True
+
+    def new_context(self):
+        return self
+
+    def new_page(self):
+        return _FakePage()
+
+    def close(self):
+        pass
+
+
+class _FakePlaywright:
+    class chromium:
+        @staticmethod
+        def launch(headless=True):
+            return _FakeBrowser()
+
+
+@contextmanager
+def _fake_sync_playwright():
+    yield _FakePlaywright()
+
+
+def _broken_sync_playwright():
+    raise RuntimeError("driver missing")
+
+
+def test_browser_pool():
+    """Test startup failures and render timeouts."""
+    print("=" * 60)
+    print("Testing Browser Pool")
+    print("=" * 60)
+
+    # 1. Playwright failing to start fails callers at once, not after the timeout
+    print("\n[1] Testing startup failure...")
+    with mock.patch('playwright.sync_api.sync_playwright', _broken_sync_playwright):
+        pool = BrowserPool(size=1)
+        started = time.monotonic()
+        try:
+            pool.run(lambda page: 'never', timeout=30)
+            assert False, "run() should raise"
+        except RuntimeError as e:
+            assert 'driver missing' in str(e)
+        assert time.monotonic() - started < 5
+        try:
+            pool.run(lambda page: 'never', timeout=30)
+            assert False, "run() should raise"
+        except RuntimeError as e:
+            assert 'unavailable' in str(e)
+        assert pool.stats()['broken']
+        pool.shutdown()
+    print("  ✓ Broken pool fails immediately")
+
+    with mock.patch('playwright.sync_api.sync_playwright', _fake_sync_playwright):
+        pool = BrowserPool(size=1)
+
+        # 2. The timeout covers the render, not the wait for a free worker
+        print("\n[2] Testing timeout excludes queue time...")
+        release = threading.Event()
+        blocker = pool.submit(lambda page: release.wait(5))
+        threading.Timer(0.6, release.set).start()
+        assert pool.run(lambda page: page.default_timeout, timeout=0.5) == 500
+        assert blocker.result(timeout=1)
+        print("  ✓ Queued render ran after 0.6s wait with a 0.5s timeout")
+
+        # 3. A render that overruns raises promptly; its page calls time out too
+        print("\n[3] Testing render timeout...")
+        pages = []
+        started = time.monotonic()
+        try:
+            pool.run(lambda page: pages.append(page) or time.sleep(0.5), timeout=0.1)
+            assert False, "run() should time out"
+        except FutureTimeoutError:
+            pass
+        assert time.monotonic() - started < 0.4
+        assert pages[0].default_timeout == 100
+        print("  ✓ Timed out after 0.1s; abandoned page limited to 100ms per call")
+
+        pool.shutdown()
+
+    print("\n" + "=" * 60)
+    print("✓ All browser pool tests passed!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    try:
+        test_browser_pool()
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,239 @@
+"""Test the bounded article cache."""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+
+from utils.cache import ArticleCache
+from utils.shared_cache import SharedCache
+from utils.singleflight import SingleFlight
+from utils.prefetch import PrefetchPool, PRIORITY_USER
+
+
+def test_article_cache():
+    """Test LRU eviction, byte limits, TTL and counters."""
+    print("=" * 60)
+    print("Testing Article Cache")
+    print("=" * 60)
+
+    # 1. LRU eviction by entry count
+    print("\n[1] Testing LRU eviction...")
+    cache = ArticleCache(max_entries=2, max_bytes=10 ** 6, ttl=60)
+    cache.set('a', {'content_cn': 'A'})
+    cache.set('b', {'content_cn': 'B'})
+    assert cache.get('a') is not None  # 'a' is now most recently used
+    cache.set('c', {'content_cn': 'C'})
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    print(f"  ✓ Least recently used entry evicted: {cache.stats()['evictions']} eviction(s)")
+
+    # 2. Byte limit
+    print("\n[2] Testing byte limit...")
+    cache = ArticleCache(max_entries=100, max_bytes=200, ttl=60)
+    for i in range(5):
+        cache.set(i, {'content_cn': '正文' * 10})
+    stats = cache.stats()
+    assert stats['bytes'] <= 200 and stats['entries'] < 5
+    cache.set('huge', {'content_cn': 'x' * 1000})
+    assert 'huge' not in cache
+    print(f"  ✓ {stats['entries']} entries kept in {stats['bytes']} bytes")
+
+    # 3. TTL expiry
+    print("\n[3] Testing TTL...")
+    cache = ArticleCache(max_entries=10, max_bytes=10 ** 6, ttl=0.05)
+    cache.set('a', {'content_cn': 'A'})
+    assert cache.get('a') is not None
+    time.sleep(0.1)
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert stats['expirations'] == 1 and stats['hits'] == 1 and stats['misses'] == 1
+    print(f"  ✓ Expired entry dropped: {stats}")
+
+    # 4. Concurrent writers
+    print("\n[4] Testing thread safety...")
+    cache = ArticleCache(max_entries=50, max_bytes=10 ** 6, ttl=60)
+
+    def writer(n):
+        for i in range(200):
+            cache.set(f"{n}-{i}", {'content_cn': str(i)})
+            cache.get(f"{n}-{i - 1}")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(cache) == 50
+    print(f"  ✓ {len(cache)} entries after concurrent writes")
+
+    print("\n" + "=" * 60)
+    print("✓ All article cache tests passed!")
+    print("=" * 60)
+
+
+def test_shared_cache():
+    """Test the SQLite-backed second level shared between workers."""
+    print("=" * 60)
+    print("Testing Shared Article Cache")
+    print("=" * 60)
+
+    tmp_dir = tempfile.mkdtemp(prefix='shared_cache_')
+    path = os.path.join(tmp_dir, 'cache.db')
+    try:
+        # 1. Two "workers" with their own local caches share the backend
+        print("\n[1] Testing read-through across workers...")
+        worker_a = ArticleCache(max_entries=10, ttl=60, backend=SharedCache(path))
+        worker_b = ArticleCache(max_entries=10, ttl=60, backend=SharedCache(path))
+        article = {'status': 'success', 'content_cn': '<p>正文</p>', 'content_ko': ['본문']}
+        worker_a.set('https://t/1', article)
+        assert worker_b.get('https://t/1') == article
+        assert worker_b.get('https://t/1') == article
+        stats = worker_b.stats()
+        assert stats['backend_hits'] == 1 and stats['hits'] == 1
+        print(f"  ✓ Worker B served worker A's article: hit_rate={stats['hit_rate']}")
+
+        # 2. Expired entries are not served
+        print("\n[2] Testing TTL...")
+        worker_a.backend.set('https://t/2', article, ttl=0.05)
+        time.sleep(0.1)
+        assert worker_b.backend.get('https://t/2') is None
+        print("  ✓ Expired entry ignored")
+
+        # 3. Size bound evicts least recently used rows
+        print("\n[3] Testing eviction...")
+        small = SharedCache(os.path.join(tmp_dir, 'small.db'), max_bytes=2000)
+        for i in range(60):
+            small.set(f"k{i}", {'content_cn': os.urandom(100).hex()})
+        small.evict()
+        stats = small.stats()
+        assert stats['bytes'] <= 2000 and stats['evictions'] > 0
+        assert small.get('k59') is not None and small.get('k0') is None
+        print(f"  ✓ {stats['entries']} entries kept, {stats['evictions']} evicted")
+
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✓ All shared cache tests passed!")
+    print("=" * 60)
+
+
+def test_singleflight():
+    """Test collapsing of concurrent calls for the same key."""
+    print("=" * 60)
+    print("Testing Single-Flight Fetches")
+    print("=" * 60)
+
+    flights = SingleFlight()
+    calls = []
+
+    def slow_fetch(url):
+        calls.append(url)
+        time.sleep(0.1)
+        if url.endswith('bad'):
+            raise ValueError('fetch failed')
+        return {'url': url}
+
+    def run_concurrently(url, n, **kwargs):
+        results = [None] * n
+
+        def worker(i):
+            try:
+                results[i] = flights.do(url, slow_fetch, url, **kwargs)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    # 1. Concurrent callers share one execution
+    print("\n[1] Testing deduplication...")
+    results = run_concurrently('https://t/1', 5)
+    assert calls == ['https://t/1']
+    assert all(r == {'url': 'https://t/1'} for r in results)
+    print(f"  ✓ 5 callers, 1 fetch: {flights.stats()}")
+
+    # 2. Errors reach every waiting caller
+    print("\n[2] Testing error propagation...")
+    results = run_concurrently('https://t/bad', 3)
+    assert all(isinstance(r, ValueError) for r in results)
+    print("  ✓ All callers received the error")
+
+    # 3. Waiters give up after their timeout
+    print("\n[3] Testing timeouts...")
+    results = run_concurrently('https://t/2', 3, timeout=0.01)
+    assert sum(isinstance(r, TimeoutError) for r in results) == 2
+    stats = flights.stats()
+    assert stats['in_flight'] == 0 and stats['timeouts'] == 2
+    print(f"  ✓ Waiters timed out, leader finished: {stats}")
+
+    print("\n" + "=" * 60)
+    print("✓ All single-flight tests passed!")
+    print("=" * 60)
+
+
+def test_prefetch_pool():
+    """Test the bounded, prioritized prefetch pool."""
+    print("=" * 60)
+    print("Testing Prefetch Pool")
+    print("=" * 60)
+
+    release = threading.Event()
+    started = []
+
+    def fetch(url):
+        started.append(url)
+        if url.startswith('slow'):
+            release.wait(5)
+        return url.upper()
+
+    pool = PrefetchPool(fetch, workers=2, max_queue=3)
+
+    # 1. Background work leaves one worker free for user requests
+    print("\n[1] Testing reserved user worker...")
+    slow = [pool.submit(f"slow-{i}") for i in range(3)]
+    time.sleep(0.1)
+    assert pool.stats()['running_background'] == 1
+    assert pool.submit('user-1', priority=PRIORITY_USER).result(timeout=1) == 'USER-1'
+    print(f"  ✓ User fetch served while prefetches queued: {pool.stats()}")
+
+    # 2. Duplicates share a Future; full queue drops background work
+    print("\n[2] Testing dedupe and bound...")
+    assert pool.submit('slow-1') is slow[1]
+    assert pool.submit('bg-1') is not None
+    assert pool.submit('bg-2') is None
+    stats = pool.stats()
+    assert stats['deduped'] == 1 and stats['dropped'] == 1
+    print(f"  ✓ deduped={stats['deduped']}, dropped={stats['dropped']}")
+
+    # 3. Promoting a queued item runs it before other background work
+    print("\n[3] Testing priority promotion...")
+    promoted = pool.submit('bg-1', priority=PRIORITY_USER)
+    assert promoted.result(timeout=1) == 'BG-1'
+    release.set()
+    assert [f.result(timeout=2) for f in slow] == ['SLOW-0', 'SLOW-1', 'SLOW-2']
+    assert started.index('bg-1') < started.index('slow-1')
+    print(f"  ✓ Run order: {started}")
+
+    print("\n" + "=" * 60)
+    print("✓ All prefetch pool tests passed!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    try:
+        test_article_cache()
+        test_shared_cache()
+        test_singleflight()
+        test_prefetch_pool()
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,100 @@
+"""Test the shared crawl status store and its event stream."""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+
+from utils.crawl_status import CrawlStatusStore
+
+
+def _parse_events(chunks):
+    """Turn SSE chunks into (event, id, data) tuples, skipping comments/retry."""
+    events = []
+    for chunk in chunks:
+        fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n') if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], fields.get('id'), json.loads(fields['data'])))
+    return events
+
+
+def test_crawl_status():
+    """Test cross-process state, exclusive starts, log retention and SSE."""
+    print("=" * 60)
+    print("Testing Crawl Status Store")
+    print("=" * 60)
+
+    tmp_dir = tempfile.mkdtemp(prefix='crawl_status_')
+    path = os.path.join(tmp_dir, 'crawl_status.db')
+    try:
+        # 1. Two "workers" see the same state; only one can start a crawl
+        print("\n[1] Testing shared state...")
+        worker_a = CrawlStatusStore(path, max_logs=5)
+        worker_b = CrawlStatusStore(path, max_logs=5)
+        assert worker_b.get('fujian')['state'] == 'idle'
+        assert worker_a.try_start('fujian', 'Starting crawl')
+        assert not worker_b.try_start('fujian')
+        assert worker_b.get('fujian')['state'] == 'running'
+        assert worker_b.recent_logs('fujian')[0].endswith('Starting crawl')
+        print(f"  ✓ Worker B sees worker A's crawl: {worker_b.to_dict('fujian')}")
+
+        # 2. Logs are trimmed per source
+        print("\n[2] Testing log retention...")
+        for i in range(10):
+            worker_a.add_log('fujian', f"page {i}")
+        worker_a.add_log('hainan', 'other source')
+        logs = worker_b.recent_logs('fujian', limit=100)
+        assert len(logs) == 5 and logs[-1].endswith('page 9')
+        assert len(worker_b.recent_logs('hainan')) == 1
+        print(f"  ✓ Kept last {len(logs)} lines")
+
+        # 3. Stream replays recent logs, then pushes changes
+        print("\n[3] Testing event stream...")
+        stream = worker_b.events(['fujian'], interval=0.01, max_seconds=0.2)
+        chunks = [next(stream) for _ in range(7)]  # retry + 5 replayed logs + status
+        worker_a.add_log('fujian', 'Saved 3 articles')
+        worker_a.update('fujian', state='completed', progress=100, total_articles=3)
+        chunks.extend(stream)
+        events = _parse_events(chunks)
+        assert [e for e, _, _ in events[:5]] == ['log'] * 5
+        statuses = [data['state'] for e, _, data in events if e == 'status']
+        assert statuses == ['running', 'completed']
+        assert any(e == 'log' and data['line'].endswith('Saved 3 articles') for e, _, data in events)
+        last_id = max(int(i) for _, i, _ in events if i)
+        print(f"  ✓ {len(events)} events, states {statuses}")
+
+        # 4. Reconnecting with Last-Event-ID resumes after that line
+        print("\n[4] Testing resume...")
+        worker_a.add_log('fujian', 'after reconnect')
+        events = _parse_events(worker_b.events(['fujian'], after_id=last_id, interval=0.01, max_seconds=0.05))
+        logs = [data['line'] for e, _, data in events if e == 'log']
+        assert len(logs) == 1 and logs[0].endswith('after reconnect')
+        print("  ✓ Only the missed line was sent")
+
+        # 5. A crawl whose worker died is not reported as running forever
+        print("\n[5] Testing stale crawls...")
+        stale = CrawlStatusStore(path, stale_after=0.05)
+        assert stale.try_start('guangxi')
+        time.sleep(0.1)
+        assert stale.get('guangxi')['state'] == 'failed'
+        assert stale.try_start('guangxi')
+        print("  ✓ Stale crawl reported failed and restartable")
+
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✓ All crawl status tests passed!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    try:
+        test_crawl_status()
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
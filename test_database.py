@@ -1,5 +1,8 @@
 """Test database operations."""
+import os
 import sys
+import shutil
+import tempfile
 from datetime import datetime
 from database import init_db, save_articles, get_articles_by_date, cleanup_old_articles, get_stats
 
@@ -10,9 +13,29 @@ def test_database():
     print("Testing Database Layer")
     print("=" * 60)
     
-    # 1. Initialize database
+    # 1. Initialize a throwaway database; never touch data/news.db
     print("\n[1] Initializing database...")
-    init_db()
+    from database import db
+    original_path = db.DB_PATH
+    tmp_dir = tempfile.mkdtemp(prefix='database_')
+    init_db(os.path.join(tmp_dir, 'news.db'))
+    try:
+        _run_steps()
+    finally:
+        db.Session.remove()
+        db.engine.dispose()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        db.init_db(original_path)
+    
+    print("\n" + "=" * 60)
+    print("✓ All database tests passed!")
+    print("=" * 60)
+    
+    return True
+
+
+def _run_steps():
+    from database import db
     
     # 2. Test save_articles
     print("\n[2] Testing save_articles...")
@@ -52,7 +75,11 @@ def test_database():
     stats = get_stats()
     print(f"  ✓ Total articles: {stats['total_articles']}")
     print(f"  ✓ Database size: {stats['db_size_mb']} MB")
+    on_disk = sum(os.path.getsize(p) for p in (db.DB_PATH, db.DB_PATH + '-wal') if os.path.exists(p))
+    assert stats['db_size_mb'] == round(on_disk / (1024 * 1024), 2)
     print(f"  ✓ By source: {stats['by_source']}")
+    assert stats['by_date'][date_str]['fujian'] == len(articles)
+    print(f"  ✓ By date: {stats['by_date'][date_str]}")
     
     # 5. Test duplicate handling (should update existing)
     print("\n[5] Testing duplicate handling...")
@@ -71,11 +98,64 @@ def test_database():
         article_dict = articles[0].to_dict()
         print(f"  ✓ Article dict keys: {list(article_dict.keys())}")
     
-    print("\n" + "=" * 60)
-    print("✓ All database tests passed!")
-    print("=" * 60)
+    # 7. Test column-projected listing read
+    print("\n[7] Testing get_article_rows...")
+    from database import get_article_rows
+    rows = get_article_rows(source_key='fujian', date_str=date_str)
+    assert len(rows) == len(articles)
+    assert set(rows[0]) == {'source', 'source_key', 'section', 'title', 'title_ko', 'link', 'date', 'starred'}
+    print(f"  ✓ Retrieved {len(rows)} rows with keys {sorted(rows[0])}")
     
-    return True
+    # 8. Test compressed article bodies
+    print("\n[8] Testing article bodies...")
+    from database import save_article_body, get_article_body
+    from database import bodies
+    body = {
+        'content_cn': '<div id="content">' + '<p>这是一篇测试新闻的正文段落。</p>' * 20 + '</div>',
+        'content_ko': ['테스트 단락'] * 20
+    }
+    # Goes to the temporary database: the test body must not count toward
+    # the dictionary training threshold of the real one
+    assert db.DB_PATH.startswith(tempfile.gettempdir())
+    save_article_body('https://test.com/article1', body)
+    assert get_article_body('https://test.com/article1') == body
+    from database.models import ArticleBody, BodyDict
+    from sqlalchemy import select, func
+    with db.engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(ArticleBody)).scalar() == 1
+        assert conn.execute(select(func.count()).select_from(BodyDict)).scalar() == 0
+    assert get_article_body('https://test.com/missing') is None
+    samples = [bodies.encode_body({'content_cn': f'<div id="content"><p>第{i}篇 福建日报 要闻</p></div>'}) for i in range(20)]
+    zdict = bodies.train_dictionary(samples)
+    assert zdict and len(bodies.compress(samples[0], zdict)) < len(bodies.compress(samples[0]))
+    assert bodies.decompress(bodies.compress(samples[0], zdict), zdict) == samples[0]
+    print(f"  ✓ Body round-trip OK, trained {len(zdict)}-byte dictionary")
+    
+    # 9. Test batched cleanup with archiving
+    print("\n[9] Testing cleanup_old_articles...")
+    import gzip
+    save_articles([{'title': '过期新闻', 'link': 'https://test.com/expired'}], 'fujian', '2000-01-01')
+    archive_dir, db.ARCHIVE_DIR = db.ARCHIVE_DIR, tempfile.mkdtemp(prefix='archive_')
+    try:
+        deleted = cleanup_old_articles(days=7, chunk_size=1, archive=True)
+        assert deleted == 1
+        with gzip.open(f"{db.ARCHIVE_DIR}/articles-2000-01.jsonl.gz", 'rt', encoding='utf-8') as f:
+            assert any('https://test.com/expired' in line for line in f)
+        assert '2000-01-01' not in get_stats()['by_date']
+        print(f"  ✓ Deleted and archived {deleted} expired articles")
+    finally:
+        shutil.rmtree(db.ARCHIVE_DIR, ignore_errors=True)
+        db.ARCHIVE_DIR = archive_dir
+    
+    # 10. Test SQLite connection tuning
+    print("\n[10] Testing SQLite pragmas...")
+    from sqlalchemy import text
+    with db.engine.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+        busy_timeout = conn.execute(text("PRAGMA busy_timeout")).scalar()
+    assert journal_mode.lower() == db.DB_JOURNAL_MODE.lower()
+    assert busy_timeout == db.DB_BUSY_TIMEOUT_MS
+    print(f"  ✓ journal_mode={journal_mode}, busy_timeout={busy_timeout}ms")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,218 @@
+"""Test the shared HTTP fetch engine against a local server."""
+import sys
+import time
+import shutil
+import tempfile
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from utils.http_engine import FetchEngine
+from utils.rate_limit import TokenBucket, HostRateLimiter
+from utils.http_cache import HttpCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    flaky_calls = 0
+    not_modified = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+
+        if self.path == '/flaky':
+            with cls.lock:
+                cls.flaky_calls += 1
+                fail = cls.flaky_calls == 1
+            if fail:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        if self.path.startswith('/etag'):
+            etag = f'"{self.path}-v1"'
+            if self.headers.get('If-None-Match') == etag:
+                with cls.lock:
+                    cls.not_modified += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+        body = '测试页面'.encode('utf-8')
+        self.send_response(200)
+        if self.path.startswith('/etag'):
+            self.send_header('ETag', f'"{self.path}-v1"')
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_http_engine():
+    """Test concurrent fetching, per-host caps and retries."""
+    print("=" * 60)
+    print("Testing HTTP Fetch Engine")
+    print("=" * 60)
+
+    server, base = _start_server()
+    engine = FetchEngine(max_concurrency=8, max_per_host=3, retries=1, rate_limiter=None, cache=None)
+
+    try:
+        # 1. Concurrent fetch keeps order and respects the per-host cap
+        print("\n[1] Testing get_many...")
+        urls = [f"{base}/page/{i}" for i in range(9)]
+        responses = engine.get_many(urls)
+        assert [r.url for r in responses] == urls
+        assert all(r.status_code == 200 for r in responses)
+        assert _Handler.peak <= 3
+        print(f"  ✓ Fetched {len(responses)} pages, peak concurrency {_Handler.peak}")
+
+        # 2. Retryable statuses are retried
+        print("\n[2] Testing retries...")
+        resp = engine.get(f"{base}/flaky")
+        assert resp.status_code == 200
+        assert _Handler.flaky_calls == 2
+        print("  ✓ 503 retried and succeeded")
+
+        # 3. Connection errors surface as exceptions in get_many
+        print("\n[3] Testing error propagation...")
+        results = engine.get_many(["http://127.0.0.1:1/unreachable"], timeout=1)
+        assert isinstance(results[0], Exception)
+        print(f"  ✓ Error returned: {type(results[0]).__name__}")
+
+    finally:
+        engine.close()
+        server.shutdown()
+
+    print("\n" + "=" * 60)
+    print("✓ All HTTP engine tests passed!")
+    print("=" * 60)
+
+
+def test_http_cache():
+    """Test conditional requests served from the on-disk cache."""
+    print("=" * 60)
+    print("Testing HTTP Conditional Cache")
+    print("=" * 60)
+
+    server, base = _start_server()
+    cache_dir = tempfile.mkdtemp(prefix='http_cache_')
+    cache = HttpCache(directory=cache_dir, max_bytes=1024 * 1024)
+    engine = FetchEngine(rate_limiter=None, cache=cache)
+
+    try:
+        # 1. First fetch stores the body, second one revalidates with a 304
+        print("\n[1] Testing revalidation...")
+        first = engine.get(f"{base}/etag/a")
+        second = engine.get(f"{base}/etag/a")
+        assert not getattr(first, 'from_cache', False)
+        assert second.from_cache and second.status_code == 200
+        assert second.text == first.text == '测试页面'
+        assert _Handler.not_modified == 1
+        # Behaves like a normal response with its body already read
+        assert second.request.url == f"{base}/etag/a"
+        assert b''.join(second.iter_content(4)) == first.content
+        second.close()
+        print(f"  ✓ 304 served from disk: {cache.stats()}")
+
+        # 2. Responses without validators are not stored
+        print("\n[2] Testing uncacheable responses...")
+        engine.get(f"{base}/plain")
+        assert cache.stats()['stores'] == 1
+        print("  ✓ Response without ETag/Last-Modified skipped")
+
+        # 3. Size bound evicts the least recently used entries
+        print("\n[3] Testing eviction...")
+        small = HttpCache(directory=f"{cache_dir}/small", max_bytes=600)
+        small_engine = FetchEngine(rate_limiter=None, cache=small)
+        for i in range(6):
+            small_engine.get(f"{base}/etag/{i}")
+        stats = small.stats()
+        small_engine.close()
+        assert stats['evictions'] > 0 and stats['size_bytes'] <= 600
+        print(f"  ✓ Evicted {stats['evictions']} entries, {stats['size_bytes']} bytes kept")
+
+    finally:
+        engine.close()
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✓ All HTTP cache tests passed!")
+    print("=" * 60)
+
+
+def test_rate_limiter():
+    """Test per-host token buckets."""
+    print("=" * 60)
+    print("Testing Per-Host Rate Limiter")
+    print("=" * 60)
+
+    # 1. Burst is free, then tokens refill at the configured rate
+    print("\n[1] Testing token bucket...")
+    bucket = TokenBucket(rate=20, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[0] == 0 and waits[1] == 0
+    assert 0.04 < waits[2] < 0.06 and 0.09 < waits[3] < 0.11
+    print(f"  ✓ Reserved waits: {[round(w, 3) for w in waits]}")
+
+    # 2. Hosts are limited independently
+    print("\n[2] Testing host isolation...")
+    limiter = HostRateLimiter({'slow.example.com': (1, 1)}, default_rate=100, default_burst=10)
+    limiter.acquire('https://slow.example.com/a')
+    start = time.monotonic()
+    for i in range(5):
+        limiter.acquire(f'https://fast.example.com/{i}')
+    assert time.monotonic() - start < 0.1
+    assert limiter.bucket('slow.example.com').reserve() > 0.5
+    print("  ✓ Busy host does not delay other hosts")
+
+    # 3. Async callers share the same buckets
+    print("\n[3] Testing asyncio acquire...")
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire_async()
+
+    start = time.monotonic()
+    asyncio.run(take(3))
+    assert time.monotonic() - start >= 0.035
+    print("  ✓ Async acquire waits for refills")
+
+    print("\n" + "=" * 60)
+    print("✓ All rate limiter tests passed!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    try:
+        test_http_engine()
+        test_http_cache()
+        test_rate_limiter()
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
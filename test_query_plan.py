@@ -0,0 +1,124 @@
+"""Test that the /api/news query is served by the composite index."""
+import os
+import sys
+import shutil
+import tempfile
+
+from sqlalchemy import create_engine, text
+
+from database.models import Base
+from database.db import migrate_schema, articles_query
+
+# Schema of the articles table before idx_source_date was introduced
+LEGACY_SCHEMA = [
+    """CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source VARCHAR(50) NOT NULL,
+        source_key VARCHAR(20) NOT NULL,
+        section VARCHAR(100),
+        title TEXT NOT NULL,
+        title_ko TEXT,
+        link VARCHAR(500) NOT NULL UNIQUE,
+        content_preview TEXT,
+        date VARCHAR(10) NOT NULL,
+        last_updated DATETIME,
+        created_at DATETIME
+    )""",
+    "CREATE INDEX idx_date ON articles (date)",
+    "CREATE INDEX idx_source ON articles (source_key)",
+    "CREATE INDEX idx_link ON articles (link)",
+]
+
+
+def _query_plan(engine, query):
+    sql = str(query.compile(engine, compile_kwargs={'literal_binds': True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def _index_names(engine):
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'articles'")
+        )}
+
+
+def test_query_plan():
+    """Test the index migration and the query plan of get_articles_by_date."""
+    print("=" * 60)
+    print("Testing /api/news Query Plan")
+    print("=" * 60)
+
+    tmp_dir = tempfile.mkdtemp(prefix='query_plan_')
+    try:
+        # 1. Fresh databases get the composite index from the models
+        print("\n[1] Testing fresh schema...")
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'fresh.db')}")
+        Base.metadata.create_all(engine)
+        indexes = _index_names(engine)
+        assert 'idx_source_date' in indexes
+        assert not {'idx_source', 'idx_link'} & indexes
+        print(f"  ✓ Indexes: {sorted(i for i in indexes if not i.startswith('sqlite_'))}")
+
+        plan = _query_plan(engine, articles_query('fujian', '2025-01-01'))
+        assert any('idx_source_date' in step for step in plan), plan
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+        print(f"  ✓ Plan: {plan}")
+        engine.dispose()
+
+        # 2. Existing databases are migrated in place
+        print("\n[2] Testing migration of a legacy schema...")
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'legacy.db')}")
+        with engine.begin() as conn:
+            for statement in LEGACY_SCHEMA:
+                conn.execute(text(statement))
+        # Same order as init_db: create missing tables, then migrate
+        Base.metadata.create_all(engine)
+        migrate_schema(engine)
+        migrate_schema(engine)  # idempotent
+        indexes = _index_names(engine)
+        assert 'idx_source_date' in indexes
+        assert not {'idx_source', 'idx_link'} & indexes
+        print("  ✓ idx_source_date created, redundant indexes dropped")
+
+        # 3. Filtering by source alone still avoids a sort
+        print("\n[3] Testing source-only query...")
+        plan = _query_plan(engine, articles_query('fujian'))
+        assert any('idx_source_date' in step for step in plan), plan
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+        print(f"  ✓ Plan: {plan}")
+
+        # 4. The starred join is a primary key lookup per row
+        print("\n[4] Testing starred join...")
+        plan = _query_plan(engine, articles_query('fujian', '2025-01-01', starred=True))
+        assert any('idx_source_date' in step for step in plan), plan
+        assert any('starred_items' in step and 'INDEX' in step for step in plan), plan
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+        print(f"  ✓ Plan: {plan}")
+
+        # 5. The batch listing (several sources, one date) seeks the index per
+        # source and needs no sort
+        print("\n[5] Testing multi-source query...")
+        plan = _query_plan(engine, articles_query(['fujian', 'hainan'], '2025-01-01', starred=True))
+        assert any('idx_source_date (source_key=? AND date=?)' in step for step in plan), plan
+        assert not any('TEMP B-TREE' in step for step in plan), plan
+        print(f"  ✓ Plan: {plan}")
+        engine.dispose()
+
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✓ All query plan tests passed!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    try:
+        test_query_plan()
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -26,9 +26,13 @@ def test_crawl_status():
     """测试爬取状态类"""
     print("\n测试爬取状态类...")
     try:
+        import tempfile
         from app import SourceCrawlStatus, CrawlState
+        from utils.crawl_status import CrawlStatusStore
         
-        status = SourceCrawlStatus('fujian')
+        # 状态保存在共享的 SQLite 中，测试使用独立的临时库
+        tmp_dir = tempfile.mkdtemp(prefix='crawl_status_')
+        status = SourceCrawlStatus('fujian', store=CrawlStatusStore(os.path.join(tmp_dir, 'status.db')))
         assert status.source_key == 'fujian'
         assert status.state == CrawlState.IDLE
         
@@ -64,6 +68,28 @@ def test_api_structure():
             assert 'logs' in data
             assert 'progress' in data
             
+            # 测试批量新闻API
+            response = client.get('/api/news?sources=fujian,hainan&date=2000-01-01')
+            assert response.status_code == 200
+            data = response.json
+            assert data['status'] == 'empty' and data['data'] == []
+            assert set(data['sources']) == {'fujian', 'hainan'}
+            assert 'crawl_status' in data['sources']['fujian']
+            assert client.get('/api/news?sources=unknown').status_code == 400
+
+            # 测试文章API: 未命中时每一级缓存只查询一次
+            from unittest import mock
+            from utils.cache import ArticleCache
+            article = {'status': 'success', 'content_cn': '<p>正文</p>', 'content_ko': ['正文']}
+            cache = ArticleCache()
+            with mock.patch('app.ARTICLE_CACHE', cache), \
+                 mock.patch('app.get_article_body', return_value=None) as body_lookup, \
+                 mock.patch('app.load_article', return_value=article) as fetch:
+                url = 'http://example.com/test-article'
+                assert client.get('/api/article', query_string={'url': url}).json == article
+                assert cache.stats()['misses'] == 1 and body_lookup.call_count == 1
+                assert fetch.call_count == 1
+
             print("✓ API响应结构测试通过")
             return True
     except Exception as e:
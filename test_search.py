@@ -0,0 +1,129 @@
+"""Test full-text search over stored articles."""
+import os
+import sys
+import shutil
+import tempfile
+
+from database import db
+from database.search import cjk_bigrams, cjk_unigrams, build_match_query
+
+
+def test_search():
+    """Test CJK bigram indexing, trigger sync and ranked search."""
+    print("=" * 60)
+    print("Testing Full-Text Search")
+    print("=" * 60)
+
+    # 1. Tokenization
+    print("\n[1] Testing bigram tokenization...")
+    assert cjk_bigrams('福建日报 GDP') == '福建 建日 日报 GDP'
+    assert build_match_query('福建 GDP') == '"福建" "GDP"'
+    assert build_match_query('  ') is None
+    assert build_match_query('西') == '"西"'
+    assert cjk_unigrams('广西 GDP', None) == '广 西'
+    print(f"  ✓ {cjk_bigrams('广西日报')!r}")
+
+    original_path = db.DB_PATH
+    tmp_dir = tempfile.mkdtemp(prefix='search_')
+    try:
+        db.init_db(os.path.join(tmp_dir, 'search.db'))
+
+        db.save_articles([
+            {'title': '福建省经济增长迅速', 'title_ko': '푸젠성 경제 성장', 'link': 'https://t/1'},
+            {'title': '海南自贸港建设提速', 'link': 'https://t/2', 'content_preview': '经济特区'},
+        ], 'fujian', '2025-01-01')
+        db.save_articles([
+            {'title': '广西经济工作会议召开', 'link': 'https://t/3'},
+        ], 'guangxi', '2025-01-02')
+
+        # 2. Ranking and filters
+        print("\n[2] Testing ranked search...")
+        rows, total = db.search_articles('经济')
+        assert total == 3
+        assert rows[-1]['link'] == 'https://t/2'  # preview-only match ranks last
+        rows, total = db.search_articles('经济', source_key='guangxi')
+        assert total == 1 and rows[0]['link'] == 'https://t/3'
+        rows, total = db.search_articles('经济', date_from='2025-01-02')
+        assert total == 1
+        rows, total = db.search_articles('경제')
+        assert total == 1 and rows[0]['link'] == 'https://t/1'
+        print(f"  ✓ Ranked results: {[r['title'] for r in db.search_articles('经济')[0]]}")
+
+        # Single characters match anywhere in a word, not just where a bigram starts
+        assert db.search_articles('西')[1] == 1
+        assert db.search_articles('济')[1] == 3
+        assert db.search_articles('广')[1] == 1
+        print("  ✓ Single-character queries match the end of a word")
+
+        # 3. Pagination
+        print("\n[3] Testing pagination...")
+        page1, total = db.search_articles('经济', per_page=2)
+        page2, _ = db.search_articles('经济', page=2, per_page=2)
+        assert total == 3 and len(page1) == 2 and len(page2) == 1
+        print("  ✓ 2 + 1 results across two pages")
+
+        # 4. Updates and deletes keep the index in sync
+        print("\n[4] Testing trigger sync...")
+        db.save_articles([{'title': '海南旅游市场火热', 'link': 'https://t/2'}], 'fujian', '2025-01-01')
+        assert db.search_articles('自贸')[1] == 0
+        assert db.search_articles('旅游')[1] == 1
+        db.cleanup_old_articles()
+        assert db.search_articles('旅游')[1] == 0
+        print("  ✓ Index follows upserts and cleanup")
+
+        # 5. Writers without the app's connection setup still work
+        print("\n[5] Testing external writers...")
+        import sqlite3
+        conn = sqlite3.connect(db.DB_PATH)
+        with conn:
+            conn.execute(
+                "INSERT INTO articles (source, source_key, title, link, date) "
+                "VALUES ('广西日报', 'guangxi', '广西糖业丰收', 'https://t/ext', '2025-01-02')"
+            )
+            conn.execute("UPDATE articles SET title_ko = '광시 설탕 산업' WHERE link = 'https://t/ext'")
+        conn.close()
+        assert db.search_articles('糖业')[1] == 0  # not indexed until rebuilt
+        db.rebuild_search_index()
+        assert db.search_articles('糖业')[1] == 1
+        assert db.search_articles('설탕')[1] == 1
+        conn = sqlite3.connect(db.DB_PATH)
+        with conn:
+            conn.execute("DELETE FROM articles WHERE link = 'https://t/ext'")
+        conn.close()
+        assert db.search_articles('糖业')[1] == 0
+        print("  ✓ Plain sqlite3 writes succeed; deletes sync, rebuild picks up the rest")
+
+        # 6. An index from before the unigram column is rebuilt on startup
+        print("\n[6] Testing upgrade of an older index...")
+        from database.search import drop_search_index
+        db.save_articles([{'title': '幸福生活在广西', 'link': 'https://t/4'}], 'guangxi', '2025-01-03')
+        with db.engine.begin() as conn:
+            drop_search_index(conn)
+            conn.exec_driver_sql(
+                "CREATE VIRTUAL TABLE articles_fts USING fts5(title, title_ko, content, tokenize='unicode61')"
+            )
+        assert db.search_articles('西')[1] == 0
+        db.init_db(db.DB_PATH)
+        assert db.search_articles('西')[1] == 1
+        print("  ✓ Index rebuilt with single-character column")
+
+    finally:
+        db.Session.remove()
+        db.engine.dispose()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        db.init_db(original_path)
+
+    print("\n" + "=" * 60)
+    print("✓ All search tests passed!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    try:
+        test_search()
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,90 @@
+"""Test the persistent starred-selection store."""
+import os
+import sys
+import shutil
+import tempfile
+
+from database import db
+
+
+def test_selection():
+    """Test starring, the since cursor, tombstones and the listing join."""
+    print("=" * 60)
+    print("Testing Starred Selection")
+    print("=" * 60)
+
+    original_path = db.DB_PATH
+    tmp_dir = tempfile.mkdtemp(prefix='selection_')
+    try:
+        db.init_db(os.path.join(tmp_dir, 'selection.db'))
+        db.save_articles([
+            {'title': '福建经济稳步增长', 'link': 'https://t/1'},
+            {'title': '福建港口吞吐量创新高', 'link': 'https://t/2'},
+        ], 'fujian', '2025-01-01')
+
+        # 1. Starring survives a "restart" (new engine on the same file)
+        print("\n[1] Testing persistence...")
+        item = {'title': '福建经济稳步增长', 'link': 'https://t/1', 'sourceKey': 'fujian', 'date': '2025-01-01'}
+        cursor1 = db.set_starred('https://t/1', True, item)
+        db.engine.dispose()
+        db.init_db(os.path.join(tmp_dir, 'selection.db'))
+        selection = db.get_starred_since()
+        assert selection['full'] and selection['cursor'] == cursor1
+        assert [i['link'] for i in selection['items']] == ['https://t/1']
+        assert selection['items'][0]['starred'] is True
+        print(f"  ✓ Selection reloaded: cursor={selection['cursor']}")
+
+        # 2. Incremental reads return only changes, with tombstones
+        print("\n[2] Testing since cursor...")
+        db.set_starred('https://t/2', True, {'title': '福建港口吞吐量创新高', 'link': 'https://t/2'})
+        cursor3 = db.set_starred('https://t/1', False)
+        changes = db.get_starred_since(cursor1)
+        assert not changes['full'] and changes['cursor'] == cursor3
+        assert [i['link'] for i in changes['items']] == ['https://t/2']
+        assert changes['removed'] == ['https://t/1']
+        assert db.get_starred_since(cursor3)['items'] == []
+        # Unknown cursor (database reset) falls back to a full read
+        assert db.get_starred_since(cursor3 + 100)['full']
+        print(f"  ✓ Changes since {cursor1}: +{len(changes['items'])} -{len(changes['removed'])}")
+
+        # 3. Re-starring without item data keeps the stored item
+        print("\n[3] Testing re-star...")
+        db.set_starred('https://t/1', True)
+        items = {i['link']: i for i in db.get_starred_since()['items']}
+        assert items['https://t/1']['title'] == '福建经济稳步增长'
+        # Without item data a new link is not added (no blank entries)
+        assert db.set_starred('https://t/new', True) is None
+        assert db.set_starred('https://t/never', False) is None
+        assert 'https://t/new' not in {i['link'] for i in db.get_starred_since()['items']}
+        print("  ✓ Stored item kept, star without item data ignored")
+
+        # 4. Listing, search and realtime items carry the flag
+        print("\n[4] Testing starred flag...")
+        db.set_starred('https://t/2', False)
+        rows = {r['link']: r['starred'] for r in db.get_article_rows('fujian', '2025-01-01')}
+        assert rows == {'https://t/1': True, 'https://t/2': False}
+        results, _ = db.search_articles('福建')
+        assert {r['link']: r['starred'] for r in results} == rows
+        assert db.starred_links(['https://t/1', 'https://t/2', 'https://t/x']) == {'https://t/1'}
+        print(f"  ✓ Flags: {rows}")
+
+    finally:
+        db.Session.remove()
+        db.engine.dispose()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        db.init_db(original_path)
+
+    print("\n" + "=" * 60)
+    print("✓ All selection tests passed!")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    try:
+        test_selection()
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,253 @@
+"""
+Long-lived Playwright browser pool shared by the crawler and /api/article.
+
+Playwright's sync API binds every object to the thread that created it, so
+each pool slot is a dedicated worker thread that owns one Chromium instance
+and one browser context. Callers submit a function that receives a fresh
+page; the worker runs it and hands the result back through a Future.
+An optional RenderProfile (utils.render_profile) is installed on the page
+first to abort resources the caller does not need.
+"""
+import os
+import queue
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Number of Chromium instances (one per worker thread)
+POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE', '2'))
+
+# Relaunch a browser after it has served this many pages to cap memory growth
+MAX_PAGES_PER_BROWSER = int(os.environ.get('BROWSER_POOL_MAX_PAGES', '50'))
+
+# Default time a caller waits for a rendered page (seconds)
+DEFAULT_TIMEOUT = 90
+
+_SHUTDOWN = object()
+
+
+class _BrowserWorker(threading.Thread):
+    """Worker thread owning a single Chromium browser and context."""
+
+    def __init__(self, pool, index):
+        super().__init__(name=f"browser-pool-{index}", daemon=True)
+        self.pool = pool
+        self.browser = None
+        self.context = None
+        self.pages_served = 0
+        self.launches = 0
+
+    def run(self):
+        try:
+            from playwright.sync_api import sync_playwright
+
+            with sync_playwright() as p:
+                self._serve(p)
+        except BaseException as e:
+            # Playwright could not start (or the loop died): fail fast from
+            # now on instead of leaving callers to time out
+            logger.error(f"✗ {self.name}: browser worker stopped: {e}")
+            self.pool._mark_broken(e)
+        finally:
+            self._close_browser()
+
+    def _serve(self, p):
+        while True:
+            task = self.pool._tasks.get()
+            if task is _SHUTDOWN:
+                break
+
+            fn, profile, stats, timeout, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            future.started.set()
+
+            try:
+                self._ensure_browser(p)
+                future.set_result(self._run_task(fn, profile, stats, timeout))
+            except BaseException as e:
+                future.set_exception(e)
+                # A crashed or disconnected browser is relaunched on the next task
+                if self.browser is not None and not self.browser.is_connected():
+                    self._close_browser()
+
+    def _ensure_browser(self, p):
+        """Health-check the current browser, (re)launching it when needed."""
+        if self.browser is not None and (
+            not self.browser.is_connected() or self.pages_served >= MAX_PAGES_PER_BROWSER
+        ):
+            logger.info(f"{self.name}: recycling browser after {self.pages_served} pages")
+            self._close_browser()
+
+        if self.browser is None:
+            self.browser = p.chromium.launch(headless=True)
+            self.context = self.browser.new_context()
+            self.pages_served = 0
+            self.launches += 1
+            logger.info(f"{self.name}: launched Chromium (launch #{self.launches})")
+
+    def _run_task(self, fn, profile, stats, timeout):
+        page = self.context.new_page()
+        try:
+            if timeout is not None:
+                # Playwright calls in an abandoned render give up around the
+                # time the caller stops waiting
+                page.set_default_timeout(timeout * 1000)
+            if profile is not None:
+                profile.apply(page, stats)
+            return fn(page)
+        finally:
+            self.pages_served += 1
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def _close_browser(self):
+        for closable in (self.context, self.browser):
+            if closable is None:
+                continue
+            try:
+                closable.close()
+            except Exception as e:
+                logger.debug(f"{self.name}: error while closing browser: {e}")
+        self.context = None
+        self.browser = None
+
+
+class BrowserPool:
+    """Fixed-size pool of Chromium workers, started lazily on first use."""
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = max(1, size)
+        self._tasks = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._broken = None  # Exception that stopped a worker, if any
+
+    def _mark_broken(self, error):
+        """Fail every queued and future task with the worker's startup error."""
+        with self._lock:
+            if self._broken is None:
+                self._broken = error
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not _SHUTDOWN and task[-1].set_running_or_notify_cancel():
+                task[-1].set_exception(error)
+
+    def _start(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool has been shut down")
+            if self._broken is not None:
+                raise RuntimeError(f"Browser pool is unavailable: {self._broken}") from self._broken
+            if not self._workers:
+                for i in range(self.size):
+                    worker = _BrowserWorker(self, i)
+                    worker.start()
+                    self._workers.append(worker)
+                logger.info(f"✓ Browser pool started with {self.size} workers")
+
+    def submit(self, fn, profile=None, stats=None, timeout=None):
+        """
+        Schedule fn(page) on a pooled browser.
+
+        Args:
+            fn: Callable receiving a Playwright Page; the page is closed afterwards
+            profile: Optional RenderProfile applied to the page before fn runs
+            stats: Optional ResourceStats collecting blocked/received counters
+            timeout: Optional default timeout for Playwright calls on the page (seconds)
+
+        Returns:
+            concurrent.futures.Future with fn's return value; its 'started'
+            Event is set when a worker picks the task up
+
+        Raises:
+            RuntimeError: The pool was shut down or its browsers cannot start
+        """
+        self._start()
+        future = Future()
+        future.started = threading.Event()
+        self._tasks.put((fn, profile, stats, timeout, future))
+        if self._broken is not None:
+            # A worker died between _start() and put(); don't strand the task
+            self._mark_broken(self._broken)
+        return future
+
+    def run(self, fn, timeout=DEFAULT_TIMEOUT, profile=None, stats=None):
+        """
+        Run fn(page) on a pooled browser and wait for its result.
+
+        timeout limits the render itself; time spent queued behind other
+        renders does not count. On timeout the task is cancelled (if it has
+        not started) and its page's Playwright calls time out as well.
+        """
+        future = self.submit(fn, profile=profile, stats=stats, timeout=timeout)
+        try:
+            # Wait for a free worker; done() covers failure while queued
+            while not future.started.wait(1):
+                if future.done():
+                    break
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def stats(self):
+        """Return basic pool statistics."""
+        return {
+            'size': self.size,
+            'started': bool(self._workers),
+            'broken': str(self._broken) if self._broken is not None else None,
+            'queued': self._tasks.qsize(),
+            'launches': sum(w.launches for w in self._workers),
+            'pages_served': sum(w.pages_served for w in self._workers),
+        }
+
+    def shutdown(self, timeout=10):
+        """Stop all workers and close their browsers."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+
+        for _ in workers:
+            self._tasks.put(_SHUTDOWN)
+        for worker in workers:
+            worker.join(timeout=timeout)
+
+        if workers:
+            logger.info("✓ Browser pool shut down")
+
+
+# Global pool instance
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Get the shared browser pool (created on first call)."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def shutdown_browser_pool():
+    """Shutdown the shared browser pool, if it was ever created."""
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,156 @@
+"""
+Bounded in-memory cache for fetched articles.
+
+Replaces the unbounded ARTICLE_CACHE dict: entries expire after a TTL and
+the least recently used ones are evicted once either the entry count or
+the (approximate) total size exceeds its limit. All operations take a
+lock, since the cache is shared by request threads and background fetches.
+
+An optional backend (utils.shared_cache.SharedCache) acts as a second
+level shared by all worker processes: misses are read through from it and
+writes go to both levels.
+"""
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+# Maximum number of cached articles
+MAX_ENTRIES = int(os.environ.get('ARTICLE_CACHE_MAX_ENTRIES', '500'))
+
+# Maximum total size of cached articles (MB, measured as JSON)
+MAX_MB = float(os.environ.get('ARTICLE_CACHE_MAX_MB', '64'))
+
+# Time to live for a cached article (seconds)
+TTL = float(os.environ.get('ARTICLE_CACHE_TTL', str(6 * 3600)))
+
+
+def _approx_size(value):
+    try:
+        return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class ArticleCache:
+    """Thread-safe LRU cache with per-entry TTL and entry/byte limits."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=int(MAX_MB * 1024 * 1024), ttl=TTL,
+                 backend=None):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value (marking it recently used) or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+                self.expirations += 1
+
+        # Read through to the shared level outside the lock
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._store(key, value, self.ttl)
+                with self._lock:
+                    self.backend_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key (article URL)
+            value: JSON-serializable value
+            ttl: Seconds to keep the entry (default: cache TTL; None/0 = no expiry)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        self._store(key, value, ttl)
+        if self.backend is not None:
+            self.backend.set(key, value, ttl=ttl)
+
+    def _store(self, key, value, ttl):
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + ttl if ttl else None)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __contains__(self, key):
+        """True if key is in the local level (the backend is not consulted)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.monotonic())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """Return size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.backend_hits + self.misses
+            stats = {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'backend_hits': self.backend_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.backend_hits) / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+        if self.backend is not None:
+            stats['backend'] = self.backend.stats()
+        return stats
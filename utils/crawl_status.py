@@ -0,0 +1,273 @@
+"""
+Crawl status and logs shared by all worker processes.
+
+Each gunicorn worker used to keep its own CRAWL_STATUS objects, so a
+status request answered by a worker other than the one running the crawl
+saw 'idle' and no logs. The state now lives in data/crawl_status.db
+(SQLite, WAL, one connection per thread, like utils.shared_cache):
+
+- crawl_status: one row per source; 'version' increases on every change
+- crawl_logs: log lines; the AUTOINCREMENT id is the Server-Sent Events
+  id, so a reconnecting client resumes after the last line it saw
+
+events() turns the store into an SSE stream for one or all sources. It
+polls the local database, which is cheap compared to every browser
+polling the API once a second.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+STATUS_PATH = os.environ.get(
+    'CRAWL_STATUS_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'crawl_status.db')
+)
+
+# Log lines kept per source
+MAX_LOGS = int(os.environ.get('CRAWL_MAX_LOGS', '100'))
+
+# A 'running' crawl with no update for this long is reported as failed
+# (the worker running it died); its source can be crawled again
+STALE_AFTER = float(os.environ.get('CRAWL_STALE_AFTER', '1800'))
+
+# How often a stream checks the store for changes (seconds)
+STREAM_INTERVAL = float(os.environ.get('CRAWL_STREAM_INTERVAL', '0.5'))
+
+# A stream ends after this long; EventSource reconnects with Last-Event-ID
+STREAM_MAX_SECONDS = float(os.environ.get('CRAWL_STREAM_MAX_SECONDS', '300'))
+
+# Comment line sent when nothing else was sent for this long (seconds)
+KEEPALIVE_INTERVAL = 15
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_status (
+    source_key TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'idle',
+    progress INTEGER NOT NULL DEFAULT 0,
+    total_articles INTEGER NOT NULL DEFAULT 0,
+    start_time TEXT,
+    end_time TEXT,
+    updated_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS crawl_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_key TEXT NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_logs_source ON crawl_logs (source_key, id);
+"""
+
+STATUS_FIELDS = ('state', 'progress', 'total_articles', 'start_time', 'end_time')
+
+
+class CrawlStatusStore:
+    """SQLite-backed crawl state and log lines, safe across processes."""
+
+    def __init__(self, path=STATUS_PATH, max_logs=MAX_LOGS, stale_after=STALE_AFTER):
+        self.path = path
+        self.max_logs = max_logs
+        self.stale_after = stale_after
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _ensure(self, conn, source_key):
+        conn.execute(
+            "INSERT OR IGNORE INTO crawl_status (source_key, updated_at) VALUES (?, ?)",
+            (source_key, time.time())
+        )
+
+    def _is_stale(self, row):
+        return row['state'] == 'running' and time.time() - row['updated_at'] > self.stale_after
+
+    def get(self, source_key):
+        """Return the status of a source as a dict (without logs)."""
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM crawl_status WHERE source_key = ?", (source_key,)).fetchone()
+        if row is None:
+            return {'source_key': source_key, 'state': 'idle', 'progress': 0, 'total_articles': 0,
+                    'start_time': None, 'end_time': None, 'version': 0}
+        return self._row_status(row)
+
+    def _row_status(self, row):
+        status = {key: row[key] for key in ('source_key',) + STATUS_FIELDS + ('version',)}
+        if self._is_stale(row):
+            status['state'] = 'failed'
+        return status
+
+    def get_many(self, source_keys):
+        """Return {source_key: status} for several sources in one query."""
+        placeholders = ', '.join('?' for _ in source_keys)
+        rows = self._conn().execute(
+            f"SELECT * FROM crawl_status WHERE source_key IN ({placeholders})", tuple(source_keys)
+        ).fetchall()
+        found = {row['source_key']: row for row in rows}
+        statuses = {}
+        for source_key in source_keys:
+            row = found.get(source_key)
+            statuses[source_key] = self._row_status(row) if row is not None else self.get(source_key)
+        return statuses
+
+    def try_start(self, source_key, message=None):
+        """
+        Mark a source as running unless it already is.
+
+        The check and the update are one statement, so of several workers
+        starting the same crawl at once exactly one wins. Logs of the
+        previous run are cleared.
+
+        Returns:
+            True if the caller should run the crawl
+        """
+        now = time.time()
+        conn = self._conn()
+        self._ensure(conn, source_key)
+        started = conn.execute(
+            "UPDATE crawl_status SET state = 'running', progress = 0, total_articles = 0, "
+            "start_time = ?, end_time = NULL, updated_at = ?, version = version + 1 "
+            "WHERE source_key = ? AND (state != 'running' OR updated_at < ?)",
+            (datetime.now().isoformat(), now, source_key, now - self.stale_after)
+        ).rowcount == 1
+        if started:
+            conn.execute("DELETE FROM crawl_logs WHERE source_key = ?", (source_key,))
+            if message:
+                self.add_log(source_key, message)
+        return started
+
+    def update(self, source_key, **fields):
+        """Set status fields (state, progress, total_articles, start_time, end_time)."""
+        unknown = set(fields) - set(STATUS_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown crawl status fields: {sorted(unknown)}")
+
+        conn = self._conn()
+        self._ensure(conn, source_key)
+        assignments = ''.join(f"{name} = ?, " for name in fields)
+        conn.execute(
+            f"UPDATE crawl_status SET {assignments}updated_at = ?, version = version + 1 WHERE source_key = ?",
+            (*fields.values(), time.time(), source_key)
+        )
+
+    def add_log(self, source_key, message):
+        """Append a timestamped log line; returns its id."""
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {message}"
+        conn = self._conn()
+        log_id = conn.execute(
+            "INSERT INTO crawl_logs (source_key, line) VALUES (?, ?)", (source_key, line)
+        ).lastrowid
+        # Counts as a heartbeat for the stale check
+        conn.execute("UPDATE crawl_status SET updated_at = ? WHERE source_key = ?", (time.time(), source_key))
+        conn.execute(
+            "DELETE FROM crawl_logs WHERE source_key = ? AND id <= ("
+            "SELECT id FROM crawl_logs WHERE source_key = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (source_key, source_key, self.max_logs)
+        )
+        return log_id
+
+    def recent_logs(self, source_key, limit=20):
+        """Return the last limit log lines of a source, oldest first."""
+        return [line for _, line in self._recent_rows(source_key, limit)]
+
+    def _recent_rows(self, source_key, limit, upto=None):
+        rows = self._conn().execute(
+            "SELECT id, line FROM crawl_logs WHERE source_key = ? AND id <= ? ORDER BY id DESC LIMIT ?",
+            (source_key, upto if upto is not None else 2 ** 63 - 1, limit)
+        ).fetchall()
+        return [tuple(row) for row in reversed(rows)]
+
+    def logs_after(self, source_keys, after_id=0, limit=500):
+        """Return (id, source_key, line) tuples with id > after_id, oldest first."""
+        placeholders = ', '.join('?' for _ in source_keys)
+        rows = self._conn().execute(
+            f"SELECT id, source_key, line FROM crawl_logs WHERE source_key IN ({placeholders}) "
+            "AND id > ? ORDER BY id LIMIT ?",
+            (*source_keys, after_id, limit)
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def to_dict(self, source_key, log_limit=20):
+        """Status plus recent logs, in the shape of the status API."""
+        status = self.get(source_key)
+        status.pop('version')
+        status['logs'] = self.recent_logs(source_key, log_limit)
+        return status
+
+    def events(self, source_keys, after_id=0, interval=STREAM_INTERVAL, max_seconds=STREAM_MAX_SECONDS):
+        """
+        Yield Server-Sent Events for the given sources.
+
+        'status' events (JSON status) are sent on connect and whenever a
+        source's status changes; 'log' events carry one log line each and
+        use the log id as event id. With after_id = 0 (a new client) the
+        recent logs are replayed first.
+        """
+        yield "retry: 3000\n\n"
+
+        if not after_id:
+            # Replay what a status request would have shown, then continue
+            # after the newest line that existed at connect time
+            after_id = self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM crawl_logs").fetchone()[0]
+            replay = []
+            for source_key in source_keys:
+                replay.extend((log_id, source_key, line)
+                              for log_id, line in self._recent_rows(source_key, 20, upto=after_id))
+            for log_id, source_key, line in sorted(replay):
+                yield _sse('log', {'source_key': source_key, 'line': line}, event_id=log_id)
+
+        versions = {}
+        deadline = time.monotonic() + max_seconds
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            sent = False
+            try:
+                for source_key in source_keys:
+                    status = self.get(source_key)
+                    key = (status['version'], status['state'])
+                    if versions.get(source_key) != key:
+                        versions[source_key] = key
+                        status.pop('version')
+                        yield _sse('status', status)
+                        sent = True
+
+                for log_id, source_key, line in self.logs_after(source_keys, after_id):
+                    after_id = log_id
+                    yield _sse('log', {'source_key': source_key, 'line': line}, event_id=log_id)
+                    sent = True
+            except sqlite3.Error as e:
+                logger.warning(f"✗ Crawl status stream read failed: {e}")
+
+            now = time.monotonic()
+            if sent:
+                last_sent = now
+            elif now - last_sent >= KEEPALIVE_INTERVAL:
+                yield ": keepalive\n\n"
+                last_sent = now
+            time.sleep(interval)
+
+
+def _sse(event, data, event_id=None):
+    message = f"event: {event}\n"
+    if event_id is not None:
+        message = f"id: {event_id}\n" + message
+    return message + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# Global store shared by all workers
+crawl_status_store = CrawlStatusStore()
@@ -1,27 +1,25 @@
 """
 Unified HTML fetcher with browser-like headers and JS redirect handling.
 """
-import time
-import random
 import re
+import asyncio
 from urllib.parse import urljoin
 import requests
 import logging
 
+from utils.http_engine import get_engine
+
 logger = logging.getLogger(__name__)
 
-# Create a session with browser-like headers
-session = requests.Session()
-session.headers.update({
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/129.0.0.0 Safari/537.36"
-    ),
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-    "Connection": "keep-alive",
-})
+
+def _decode_response(resp) -> str:
+    """Decode a response body, fixing the encoding first (CPU-bound)."""
+    # CRITICAL: Fix encoding to avoid 乱码
+    # If encoding is None or ISO-8859-1 (default fallback), use apparent_encoding
+    if resp.encoding is None or resp.encoding.lower() == "iso-8859-1":
+        resp.encoding = resp.apparent_encoding or "utf-8"
+    
+    return resp.text
 
 
 def fetch_html(url: str, max_js_redirect: int = 2) -> str:
@@ -29,7 +27,7 @@ def fetch_html(url: str, max_js_redirect: int = 2) -> str:
     Universal HTML fetcher with:
     - Browser User-Agent and headers
     - Proper encoding handling (fixes 乱码 issues)
-    - Simple rate limiting
+    - Per-host token-bucket rate limiting (via the shared fetch engine)
     - Common JS redirect handling (window.location.href)
     
     Args:
@@ -39,20 +37,32 @@ def fetch_html(url: str, max_js_redirect: int = 2) -> str:
     Returns:
         The HTML content as a string with correct encoding
     """
-    for redirect_count in range(max_js_redirect):
-        # Light rate limiting to avoid bot detection
-        time.sleep(random.uniform(0.5, 1.2))
+    return get_engine().run(fetch_html_async(url, max_js_redirect))
+
+
+async def fetch_html_async(url: str, max_js_redirect: int = 2) -> str:
+    """
+    Async version of fetch_html for use on the fetch engine's event loop.
+    
+    Args:
+        url: The URL to fetch
+        max_js_redirect: Maximum number of JS redirects to follow
         
+    Returns:
+        The HTML content as a string with correct encoding
+    """
+    loop = asyncio.get_running_loop()
+    
+    for redirect_count in range(max_js_redirect):
+        # Politeness is handled per host by the engine's token buckets,
+        # so unrelated hosts (and thread-pool callers) are not serialized
         try:
-            resp = session.get(url, timeout=15)
+            # Pooled, keep-alive connection with retries from the shared engine
+            resp = await get_engine().fetch(url, timeout=15)
             resp.raise_for_status()
             
-            # CRITICAL: Fix encoding to avoid 乱码
-            # If encoding is None or ISO-8859-1 (default fallback), use apparent_encoding
-            if resp.encoding is None or resp.encoding.lower() == "iso-8859-1":
-                resp.encoding = resp.apparent_encoding or "utf-8"
-            
-            text = resp.text
+            # Encoding detection can be slow; keep it off the event loop
+            text = await loop.run_in_executor(None, _decode_response, resp)
             
             # Log first part of content for debugging (only on first fetch)
             if redirect_count == 0:
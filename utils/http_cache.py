@@ -0,0 +1,262 @@
+"""
+On-disk HTTP conditional-request cache.
+
+E-paper node and section pages rarely change once published, yet every
+crawl used to download them in full. The cache keeps each successful
+response body next to its validators (ETag / Last-Modified); the next
+request for the same URL carries If-None-Match / If-Modified-Since, and a
+304 answer is served from disk. Total size is bounded: when the cache
+grows past its limit the least recently used entries are evicted.
+
+Each entry is two files named after the SHA-1 of the URL:
+    <key>.json   url, validators, headers, stored_at
+    <key>.body   raw response bytes
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get(
+    'HTTP_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'http_cache')
+)
+
+# Upper bound for the cache directory (MB)
+CACHE_MAX_MB = float(os.environ.get('HTTP_CACHE_MAX_MB', '200'))
+
+# Set HTTP_CACHE_ENABLED=0 to turn conditional requests off
+CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', '1') != '0'
+
+# Response headers kept with the body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Content-Language')
+
+# After eviction the cache is trimmed to this fraction of its limit
+EVICT_TARGET = 0.9
+
+
+class HttpCache:
+    """Size-bounded, thread-safe disk cache keyed by URL."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=int(CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # computed lazily from the directory
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    # ============ Paths ============
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    def _entry_size(self, meta_path, body_path):
+        size = 0
+        for path in (meta_path, body_path):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    # ============ Lookup ============
+
+    def lookup(self, url):
+        """
+        Return the cached metadata for url, or None.
+
+        Returns:
+            Dict with 'url', 'etag', 'last_modified', 'headers', 'stored_at'
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('url') != url or not os.path.exists(body_path):
+            return None
+        return meta
+
+    def conditional_headers(self, meta):
+        """Build If-None-Match / If-Modified-Since headers from cached validators."""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load_response(self, url, meta, request=None):
+        """
+        Rebuild a 200 response from disk (used when the server answers 304).
+
+        Args:
+            url: Requested URL
+            meta: Cache entry from lookup()
+            request: PreparedRequest of the revalidation (default: a plain GET of url)
+
+        Returns:
+            requests.Response with from_cache=True, or None if the body is gone
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.reason = 'OK'
+        resp.url = url
+        resp.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = body
+        # The body is already in memory: close(), iter_content() and
+        # iter_lines() must not touch the (absent) raw stream
+        resp._content_consumed = True
+        resp.request = request if request is not None else requests.Request('GET', url).prepare()
+        resp.from_cache = True
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(body)
+        return resp
+
+    # ============ Store ============
+
+    def is_cacheable(self, resp):
+        """Only complete 200 responses carrying a validator are worth keeping."""
+        if resp.status_code != 200:
+            return False
+        if 'no-store' in resp.headers.get('Cache-Control', '').lower():
+            return False
+        return bool(resp.headers.get('ETag') or resp.headers.get('Last-Modified'))
+
+    def store(self, url, resp):
+        """Write a response body and its validators to disk."""
+        if not self.is_cacheable(resp):
+            with self._lock:
+                self.misses += 1
+            return False
+
+        body = resp.content
+        if len(body) > self.max_bytes:
+            return False
+
+        meta = {
+            'url': url,
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'headers': {k: resp.headers[k] for k in STORED_HEADERS if k in resp.headers},
+            'stored_at': time.time(),
+        }
+        meta_path, body_path = self._paths(url)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with self._lock:
+                self._ensure_size()
+                old_size = self._entry_size(meta_path, body_path)
+                # Write to temp files and rename so readers never see half an entry
+                for path, data in ((body_path, body),
+                                   (meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))):
+                    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+
+                self._size += self._entry_size(meta_path, body_path) - old_size
+                self.misses += 1
+                self.stores += 1
+                if self._size > self.max_bytes:
+                    self._evict()
+            return True
+        except OSError as e:
+            logger.warning(f"✗ Could not write HTTP cache entry for {url}: {e}")
+            return False
+
+    # ============ Eviction ============
+
+    def _ensure_size(self):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._scan())
+
+    def _scan(self):
+        """List (meta_path, size, last_used) for every entry in the directory."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                last_used = os.path.getmtime(meta_path)
+            except OSError:
+                continue
+            entries.append((meta_path, self._entry_size(meta_path, body_path), last_used))
+        return entries
+
+    def _evict(self):
+        """Remove least recently used entries until under EVICT_TARGET of the limit."""
+        target = self.max_bytes * EVICT_TARGET
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        self._size = sum(size for _, size, _ in entries)
+
+        for meta_path, size, _ in entries:
+            if self._size <= target:
+                break
+            body_path = meta_path[:-len('.json')] + '.body'
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Return cache counters."""
+        with self._lock:
+            self._ensure_size()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'bytes_saved': self.bytes_saved,
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# Global cache shared by the fetch engine (None when disabled)
+http_cache = HttpCache() if CACHE_ENABLED else None
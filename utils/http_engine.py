@@ -0,0 +1,240 @@
+"""
+Shared asyncio-based HTTP fetch engine.
+
+All crawler HTTP traffic goes through one engine so that connections are
+pooled and kept alive across sources, and so that concurrency is capped
+both globally and per host. Every attempt also takes a token from the
+host's bucket in utils.rate_limit, which replaces blanket sleeps, and
+plain GETs are revalidated against the on-disk cache in utils.http_cache
+(a 304 is answered from disk).
+Requests are issued with a pooled requests.Session on a bounded thread
+pool and orchestrated by an asyncio event loop running in a background
+thread:
+
+- async callers:  await engine.fetch(url) / await engine.fetch_many(urls)
+- sync callers:   engine.get(url) / engine.get_many(urls)
+
+Responses are ordinary requests.Response objects, so existing parsing
+code (resp.encoding, resp.text, resp.status_code) keeps working.
+"""
+import os
+import asyncio
+import logging
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.rate_limit import limiter as default_limiter
+from utils.http_cache import http_cache as default_cache
+
+logger = logging.getLogger(__name__)
+
+# Maximum in-flight requests across all hosts
+MAX_CONCURRENCY = int(os.environ.get('HTTP_MAX_CONCURRENCY', '16'))
+
+# Maximum in-flight requests against a single host
+MAX_PER_HOST = int(os.environ.get('HTTP_MAX_PER_HOST', '4'))
+
+# Default request timeout (seconds)
+DEFAULT_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', '15'))
+
+# Extra attempts for connection errors, timeouts and retryable statuses
+MAX_RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/129.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    "Connection": "keep-alive",
+}
+
+
+class FetchEngine:
+    """Pooled HTTP client with global and per-host concurrency caps and retries."""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, max_per_host=MAX_PER_HOST,
+                 timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, rate_limiter=default_limiter,
+                 cache=default_cache):
+        """
+        Args:
+            max_concurrency: Maximum in-flight requests overall
+            max_per_host: Maximum in-flight requests per host
+            timeout: Default request timeout in seconds
+            retries: Extra attempts for transient failures
+            rate_limiter: HostRateLimiter applied per attempt (None disables)
+            cache: HttpCache used for conditional requests (None disables)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_per_host = max(1, max_per_host)
+        self.timeout = timeout
+        self.retries = retries
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=self.max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='http-engine')
+        self._loop = None
+        self._loop_thread = None
+        self._start_lock = threading.Lock()
+
+        # Created on the engine loop
+        self._global_sem = None
+        self._host_sems = {}
+
+    # ============ Event loop ============
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name='http-engine-loop', daemon=True
+                )
+                self._loop_thread.start()
+        return self._loop
+
+    def run(self, coro):
+        """Run a coroutine on the engine loop and wait for its result (sync facade)."""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._loop_thread:
+            coro.close()
+            raise RuntimeError("FetchEngine.run() called from the engine loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _host_semaphore(self, host):
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_per_host)
+            self._host_sems[host] = sem
+        return sem
+
+    # ============ Blocking request ============
+
+    def _send(self, url, headers, timeout, kwargs):
+        """GET url on a worker thread, revalidating against the HTTP cache."""
+        # Only plain GETs are cached; params etc. would change the resource
+        if self.cache is None or kwargs:
+            return self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+        cached = self.cache.lookup(url)
+        request_headers = headers
+        if cached is not None:
+            request_headers = {**(headers or {}), **self.cache.conditional_headers(cached)}
+
+        resp = self.session.get(url, headers=request_headers, timeout=timeout)
+
+        if resp.status_code == 304 and cached is not None:
+            hit = self.cache.load_response(url, cached, request=resp.request)
+            if hit is not None:
+                resp.close()
+                return hit
+            # Body vanished (evicted meanwhile); fetch it unconditionally
+            resp = self.session.get(url, headers=headers, timeout=timeout)
+
+        self.cache.store(url, resp)
+        return resp
+
+    # ============ Async API ============
+
+    async def fetch(self, url, headers=None, timeout=None, **kwargs):
+        """
+        GET a URL, honouring concurrency caps and retrying transient failures.
+
+        Args:
+            url: URL to fetch
+            headers: Optional per-request headers (merged over the defaults)
+            timeout: Request timeout in seconds (default: engine timeout)
+            **kwargs: Passed through to requests.Session.get
+
+        Returns:
+            requests.Response (any status; callers decide what to do with 4xx).
+            Responses served from the HTTP cache have from_cache=True.
+
+        Raises:
+            requests.RequestException after the last failed attempt
+        """
+        if self._global_sem is None:
+            self._global_sem = asyncio.Semaphore(self.max_concurrency)
+
+        loop = asyncio.get_running_loop()
+        host = urlparse(url).netloc
+        request = partial(
+            self._send, url, headers,
+            timeout if timeout is not None else self.timeout, kwargs
+        )
+
+        async with self._global_sem, self._host_semaphore(host):
+            for attempt in range(self.retries + 1):
+                last_attempt = attempt == self.retries
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async(host)
+                try:
+                    resp = await loop.run_in_executor(self._executor, request)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if last_attempt:
+                        raise
+                    logger.debug(f"Retrying {url} after error: {e}")
+                else:
+                    if resp.status_code not in RETRY_STATUSES or last_attempt:
+                        return resp
+                    logger.debug(f"Retrying {url} after HTTP {resp.status_code}")
+
+                await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+    async def fetch_many(self, urls, **kwargs):
+        """
+        Fetch several URLs concurrently.
+
+        Returns:
+            List aligned with urls; each item is a Response or the exception raised
+        """
+        return await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls), return_exceptions=True)
+
+    # ============ Sync facade ============
+
+    def get(self, url, **kwargs):
+        """Blocking equivalent of fetch()."""
+        return self.run(self.fetch(url, **kwargs))
+
+    def get_many(self, urls, **kwargs):
+        """Blocking equivalent of fetch_many()."""
+        return self.run(self.fetch_many(urls, **kwargs))
+
+    def close(self):
+        """Stop the loop and release pooled connections."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=5)
+            self._loop = None
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+# Global engine instance
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Get the shared fetch engine (created on first call)."""
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            _engine = FetchEngine()
+        return _engine
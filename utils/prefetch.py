@@ -0,0 +1,177 @@
+"""
+Bounded, prioritized worker pool for article fetches.
+
+Replaces the thread-per-star prefetch: starring fifty articles used to
+start fifty threads (and for Guangxi, potentially fifty browser renders).
+Fetches are queued by URL with a priority and run on a fixed number of
+worker threads:
+
+- PRIORITY_USER for an article a user is opening right now
+- PRIORITY_BACKGROUND for star-triggered prefetches
+
+Higher priority items are always taken first, and background work may
+occupy at most workers - 1 threads, so a user-opened article never waits
+behind a wall of prefetches. A URL that is already queued or running is
+not queued twice: the caller gets the existing Future (and a queued
+background item is promoted if a user now wants it).
+"""
+import os
+import heapq
+import logging
+import itertools
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 10
+
+# Worker threads; one is kept free of background work
+WORKERS = int(os.environ.get('PREFETCH_WORKERS', '3'))
+
+# Maximum queued background items; further prefetches are dropped
+MAX_QUEUE = int(os.environ.get('PREFETCH_MAX_QUEUE', '200'))
+
+
+class PrefetchPool:
+    """Fixed-size worker pool with priorities and per-URL deduplication."""
+
+    def __init__(self, fn, workers=WORKERS, max_queue=MAX_QUEUE):
+        """
+        Args:
+            fn: Callable run as fn(url) on a worker thread
+            workers: Number of worker threads (started lazily)
+            max_queue: Maximum queued background items
+        """
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.max_background = max(1, self.workers - 1)
+
+        self._cond = threading.Condition()
+        self._heap = []            # (priority, seq, url)
+        self._queued = {}          # url -> (priority, Future)
+        self._running = {}         # url -> (priority, Future)
+        self._seq = itertools.count()
+        self._threads = []
+
+        self.completed = 0
+        self.failed = 0
+        self.deduped = 0
+        self.dropped = 0
+
+    def _start(self):
+        if not self._threads:
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"prefetch-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, url, priority=PRIORITY_BACKGROUND):
+        """
+        Queue a fetch of url unless it is already queued or running.
+
+        Returns:
+            Future with fn(url)'s result, or None if the queue was full
+        """
+        with self._cond:
+            self._start()
+
+            if url in self._running:
+                self.deduped += 1
+                return self._running[url][1]
+
+            if url in self._queued:
+                self.deduped += 1
+                queued_priority, future = self._queued[url]
+                if priority < queued_priority:
+                    # Promote: push a new heap entry; the old one is skipped as stale
+                    self._queued[url] = (priority, future)
+                    heapq.heappush(self._heap, (priority, next(self._seq), url))
+                    self._cond.notify()
+                return future
+
+            if priority >= PRIORITY_BACKGROUND and self._background_queued() >= self.max_queue:
+                self.dropped += 1
+                logger.warning(f"✗ Prefetch queue full, dropping {url}")
+                return None
+
+            future = Future()
+            self._queued[url] = (priority, future)
+            heapq.heappush(self._heap, (priority, next(self._seq), url))
+            self._cond.notify()
+            return future
+
+    def _background_queued(self):
+        return sum(1 for priority, _ in self._queued.values() if priority >= PRIORITY_BACKGROUND)
+
+    def _background_running(self):
+        return sum(1 for priority, _ in self._running.values() if priority >= PRIORITY_BACKGROUND)
+
+    def _next_task(self):
+        """Pop the next runnable item (caller holds the lock), or None."""
+        while self._heap:
+            priority, _, url = self._heap[0]
+            queued = self._queued.get(url)
+            if queued is None or queued[0] != priority:
+                heapq.heappop(self._heap)  # stale (promoted) entry
+                continue
+            if priority >= PRIORITY_BACKGROUND and self._background_running() >= self.max_background:
+                # Keep a worker free for user requests
+                return None
+            heapq.heappop(self._heap)
+            del self._queued[url]
+            self._running[url] = queued
+            return url, queued
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    self._cond.wait()
+                    task = self._next_task()
+            url, (priority, future) = task
+
+            if not future.set_running_or_notify_cancel():
+                result, error = None, None
+            else:
+                try:
+                    result, error = self.fn(url), None
+                except Exception as e:
+                    result, error = None, e
+
+            with self._cond:
+                del self._running[url]
+                if error is None:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                # A background slot may have freed up
+                self._cond.notify_all()
+
+            if future.running():
+                if error is None:
+                    future.set_result(result)
+                else:
+                    logger.error(f"✗ Prefetch of {url} failed: {error}")
+                    future.set_exception(error)
+
+    def stats(self):
+        """Return queue depth, running fetches and counters."""
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'started': bool(self._threads),
+                'queued': len(self._queued),
+                'queued_background': self._background_queued(),
+                'running': len(self._running),
+                'running_background': self._background_running(),
+                'max_queue': self.max_queue,
+                'completed': self.completed,
+                'failed': self.failed,
+                'deduped': self.deduped,
+                'dropped': self.dropped,
+            }
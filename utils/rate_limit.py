@@ -0,0 +1,118 @@
+"""
+Per-host token-bucket rate limiting.
+
+Each host gets its own bucket, so politeness towards one newspaper no
+longer slows down requests to another. Buckets are thread-safe and can be
+awaited from asyncio code: a caller reserves a token under a short lock
+and then sleeps (time.sleep or asyncio.sleep) for however long the
+reservation says, so waiting never holds the lock.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Default requests per second and burst size for hosts not listed below
+DEFAULT_RATE = float(os.environ.get('HTTP_RATE_DEFAULT', '2'))
+DEFAULT_BURST = int(os.environ.get('HTTP_BURST_DEFAULT', '4'))
+
+# Per-host (rate, burst). Override or extend with
+# HTTP_RATE_LIMITS="gzdaily.dayoo.com=2:4,epaper.southcn.com=1:2"
+HOST_LIMITS = {
+    'gzdaily.dayoo.com': (2.0, 4),
+    'epaper.southcn.com': (2.0, 4),
+    'epaper.nfnews.com': (2.0, 4),
+    'fjrb.fjdaily.com': (2.0, 4),
+    'news.hndaily.cn': (2.0, 4),
+    'ssw.gxrb.com.cn': (1.0, 2),
+}
+
+
+def _parse_env_limits(value):
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        try:
+            host, spec = item.split('=')
+            rate, burst = spec.split(':')
+            limits[host.strip()] = (float(rate), int(burst))
+        except ValueError:
+            logger.warning(f"Ignoring malformed rate limit '{item}'")
+    return limits
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/second, holding at most `burst`."""
+
+    def __init__(self, rate, burst):
+        self.rate = max(rate, 0.001)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token, borrowing against future refills if the bucket is empty.
+
+        Returns:
+            Seconds the caller must wait before proceeding (0 if none)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block the current thread until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Lazily created token bucket per host."""
+
+    def __init__(self, limits=None, default_rate=DEFAULT_RATE, default_burst=DEFAULT_BURST):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url_or_host):
+        """Get the bucket for a URL or bare host name."""
+        host = urlparse(url_or_host).hostname if '//' in url_or_host else url_or_host
+        host = host or ''
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.limits.get(host, (self.default_rate, self.default_burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url_or_host):
+        return self.bucket(url_or_host).acquire()
+
+    async def acquire_async(self, url_or_host):
+        return await self.bucket(url_or_host).acquire_async()
+
+
+# Global limiter shared by every HTTP caller
+limiter = HostRateLimiter({**HOST_LIMITS, **_parse_env_limits(os.environ.get('HTTP_RATE_LIMITS', ''))})
@@ -0,0 +1,129 @@
+"""
+Playwright rendering profiles: which requests a page is allowed to make.
+
+The crawler only ever reads page.inner_text('body'), so images, media,
+fonts, stylesheets and analytics beacons are pure overhead. A profile is
+applied with page.route() before navigation and aborts those requests.
+"""
+import os
+import logging
+import threading
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Third-party analytics / tracking hosts (matched by suffix)
+ANALYTICS_HOSTS = (
+    'hm.baidu.com',
+    'tongji.baidu.com',
+    'zz.bdstatic.com',
+    'cnzz.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'res.wx.qq.com',
+)
+
+HEAVY_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet')
+
+
+class RenderProfile:
+    """Set of resource types and hosts aborted while rendering a page."""
+
+    def __init__(self, name, block_types=(), block_hosts=()):
+        self.name = name
+        self.block_types = frozenset(block_types)
+        self.block_hosts = tuple(block_hosts)
+
+    @property
+    def blocks_anything(self):
+        return bool(self.block_types or self.block_hosts)
+
+    def block_reason(self, request):
+        """Return why a request should be aborted ('image', 'analytics', ...) or None."""
+        if request.resource_type in self.block_types:
+            return request.resource_type
+
+        host = urlparse(request.url).hostname or ''
+        if any(host == h or host.endswith('.' + h) for h in self.block_hosts):
+            return 'analytics'
+
+        return None
+
+    def apply(self, page, stats=None):
+        """Install this profile's request interception on a page."""
+        if self.blocks_anything:
+            def handle_route(route):
+                reason = self.block_reason(route.request)
+                if reason:
+                    if stats is not None:
+                        stats.record_blocked(reason)
+                    route.abort()
+                else:
+                    route.continue_()
+
+            page.route('**/*', handle_route)
+
+        if stats is not None:
+            page.on('response', stats.record_response)
+
+
+PROFILES = {
+    'full': RenderProfile('full'),
+    'light': RenderProfile('light', HEAVY_RESOURCE_TYPES, ANALYTICS_HOSTS),
+}
+
+# Default profile per source; override with RENDER_PROFILE_<SOURCE>=full|light
+SOURCE_PROFILES = {
+    'guangxi': 'light',
+}
+
+
+def get_render_profile(source_key):
+    """Get the rendering profile configured for a source."""
+    name = os.environ.get(f'RENDER_PROFILE_{source_key.upper()}', SOURCE_PROFILES.get(source_key, 'full'))
+    if name not in PROFILES:
+        logger.warning(f"Unknown render profile '{name}' for {source_key}, using 'full'")
+        name = 'full'
+    return PROFILES[name]
+
+
+class ResourceStats:
+    """Thread-safe counters for blocked requests and received bytes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.blocked = {}
+        self.responses = 0
+        self.bytes_received = 0
+
+    def record_blocked(self, reason):
+        with self._lock:
+            self.blocked[reason] = self.blocked.get(reason, 0) + 1
+
+    def record_response(self, response):
+        # Content-Length is cheap to read; bodies without it are not counted
+        try:
+            size = int(response.headers.get('content-length', 0))
+        except ValueError:
+            size = 0
+        with self._lock:
+            self.responses += 1
+            self.bytes_received += size
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'blocked': dict(self.blocked),
+                'blocked_total': sum(self.blocked.values()),
+                'responses': self.responses,
+                'bytes_received': self.bytes_received,
+            }
+
+    def summary(self):
+        """One-line summary for crawl logs."""
+        data = self.to_dict()
+        by_type = ', '.join(f"{k}: {v}" for k, v in sorted(data['blocked'].items()))
+        return (
+            f"Blocked {data['blocked_total']} requests ({by_type or 'none'}), "
+            f"received {data['bytes_received'] / 1024:.0f} KB in {data['responses']} responses"
+        )
@@ -0,0 +1,187 @@
+"""
+Cross-process key-value cache backed by SQLite.
+
+gunicorn runs several workers, each with its own in-memory ArticleCache.
+This store lives in data/cache.db (separate from news.db, so cache churn
+never competes with crawl writes) and is shared by every worker, so an
+article fetched by one worker is a cache hit in all of them. It sits
+behind ArticleCache as a second level (see utils.cache).
+
+Values are JSON, zlib-compressed. Entries carry an expiry time and the
+store is kept under a size bound by evicting least recently used rows.
+Each thread uses its own sqlite3 connection; WAL mode lets readers in all
+processes proceed while one of them writes.
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get(
+    'SHARED_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'cache.db')
+)
+
+# Upper bound for stored values (MB, compressed)
+CACHE_MAX_MB = float(os.environ.get('SHARED_CACHE_MAX_MB', '256'))
+
+# Set SHARED_CACHE_ENABLED=0 to keep caches per process
+CACHE_ENABLED = os.environ.get('SHARED_CACHE_ENABLED', '1') != '0'
+
+# Check the size bound every this many writes
+EVICT_CHECK_INTERVAL = 50
+
+# Refresh accessed_at at most this often per entry (seconds); avoids a
+# write on every read
+TOUCH_INTERVAL = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+class SharedCache:
+    """SQLite key-value store with TTL and LRU size bound, safe across processes."""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=int(CACHE_MAX_MB * 1024 * 1024)):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key, default=None):
+        """Return the stored value, or default if missing or expired."""
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM kv WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count('misses')
+                return default
+
+            value, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute("DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, now))
+                self._count('misses')
+                return default
+
+            if now - accessed_at > TOUCH_INTERVAL:
+                conn.execute("UPDATE kv SET accessed_at = ? WHERE key = ?", (now, key))
+
+            self._count('hits')
+            return json.loads(zlib.decompress(value).decode('utf-8'))
+        except (sqlite3.Error, ValueError, zlib.error) as e:
+            logger.warning(f"✗ Shared cache read failed for {key}: {e}")
+            self._count('errors')
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value for ttl seconds (None/0 = no expiry)."""
+        now = time.time()
+        try:
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+            if len(blob) > self.max_bytes:
+                return
+            self._conn().execute(
+                "INSERT OR REPLACE INTO kv (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl if ttl else None, now)
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"✗ Shared cache write failed for {key}: {e}")
+            self._count('errors')
+            return
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICT_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+
+    def delete(self, key):
+        try:
+            self._conn().execute("DELETE FROM kv WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"✗ Shared cache delete failed for {key}: {e}")
+            self._count('errors')
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        try:
+            conn = self._conn()
+            conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM kv").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            excess = total - self.max_bytes
+            removed = 0
+            doomed = []
+            for key, size in conn.execute("SELECT key, size FROM kv ORDER BY accessed_at").fetchall():
+                if removed >= excess:
+                    break
+                doomed.append((key,))
+                removed += size
+            conn.executemany("DELETE FROM kv WHERE key = ?", doomed)
+            with self._lock:
+                self.evictions += len(doomed)
+        except sqlite3.Error as e:
+            logger.warning(f"✗ Shared cache eviction failed: {e}")
+            self._count('errors')
+
+    def stats(self):
+        """Return store size and this process's counters."""
+        try:
+            entries, size = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM kv"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        with self._lock:
+            return {
+                'path': self.path,
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'errors': self.errors,
+            }
+
+
+# Global store shared by all workers (None when disabled)
+shared_cache = SharedCache() if CACHE_ENABLED else None
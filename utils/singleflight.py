@@ -0,0 +1,87 @@
+"""
+Single-flight call deduplication.
+
+While a call for a key is running, further callers for the same key do
+not start their own; they wait for the first call and receive its result
+(or its exception). Used to collapse concurrent fetches of one article,
+e.g. a user opening an article while a star-triggered prefetch of it is
+still running.
+
+Deduplication is per process; across gunicorn workers the shared article
+cache (utils.shared_cache) prevents repeat fetches once one has finished.
+"""
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by an arbitrary hashable key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future
+
+        self.executions = 0
+        self.collapsed = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def do(self, key, fn, *args, timeout=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Args:
+            key: Deduplication key (e.g., article URL)
+            fn: Callable to run for the first caller
+            timeout: Seconds a waiting caller waits for the in-flight call
+                (None = wait indefinitely); the first caller is not limited
+
+        Returns:
+            fn's return value, shared by all concurrent callers
+
+        Raises:
+            Whatever fn raised (for every caller), or TimeoutError for a
+            waiting caller whose timeout expired
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                raise TimeoutError(f"Timed out waiting for in-flight call {key!r}")
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self.errors += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self):
+        """Return in-flight count and counters."""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'collapsed': self.collapsed,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+            }